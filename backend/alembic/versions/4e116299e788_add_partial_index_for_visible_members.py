@@ -0,0 +1,46 @@
+"""add partial index for visible members
+
+Revision ID: 4e116299e788
+Revises: 856b932b4ed0
+Create Date: 2026-10-18 15:21:09.384512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4e116299e788'
+down_revision: Union[str, Sequence[str], None] = '856b932b4ed0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Only visible rows are indexed, so hidden alumni/interns never grow it.
+    # Covers "role = ? AND is_visible ORDER BY created_at DESC, id DESC" used by
+    # list_team_members / list_intern_members (and their cursor pages).
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_members_visible_role_created_at_id',
+            'members',
+            ['role', sa.text('created_at DESC'), sa.text('id DESC')],
+            unique=False,
+            postgresql_where=sa.text('is_visible'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_members_visible_role_created_at_id',
+            table_name='members',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
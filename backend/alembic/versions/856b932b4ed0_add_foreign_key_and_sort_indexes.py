@@ -0,0 +1,67 @@
+"""add foreign key and sort indexes
+
+Revision ID: 856b932b4ed0
+Revises: c3f1a9d2e847
+Create Date: 2026-10-18 14:03:27.551920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '856b932b4ed0'
+down_revision: Union[str, Sequence[str], None] = 'c3f1a9d2e847'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, table, columns) - kept in sync with the Index() entries on the models
+INDEXES = [
+    # Foreign keys that are not the first column of a primary key
+    ('ix_project_feedbacks_project_id_created_at', 'project_feedbacks', ['project_id', sa.text('created_at DESC')]),
+    ('ix_opportunity_requirements_opportunity_id_order', 'opportunity_requirements', ['opportunity_id', 'order']),
+    ('ix_training_benefits_training_id', 'training_benefits', ['training_id']),
+    ('ix_training_mentors_mentor_id', 'training_mentors', ['mentor_id']),
+    ('ix_service_tech_map_tech_id', 'service_tech_map', ['tech_id']),
+    ('ix_service_offering_map_offering_id', 'service_offering_map', ['offering_id']),
+    ('ix_project_tech_map_tech_id', 'project_tech_map', ['tech_id']),
+    # Keyset pagination order of the list endpoints (created_at DESC, id DESC)
+    ('ix_services_created_at_id', 'services', [sa.text('created_at DESC'), sa.text('id DESC')]),
+    ('ix_projects_created_at_id', 'projects', [sa.text('created_at DESC'), sa.text('id DESC')]),
+    ('ix_trainings_created_at_id', 'trainings', [sa.text('created_at DESC'), sa.text('id DESC')]),
+    ('ix_members_created_at_id', 'members', [sa.text('created_at DESC'), sa.text('id DESC')]),
+    ('ix_opportunities_created_at_id', 'opportunities', [sa.text('created_at DESC'), sa.text('id DESC')]),
+    ('ix_mentors_name_id', 'mentors', ['name', 'id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY does not lock the tables against writes, but it cannot run
+    # inside a transaction, so each index is created in autocommit mode.
+    # If one fails, Postgres leaves it INVALID: drop it by hand and re-run.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
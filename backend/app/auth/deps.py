@@ -1,13 +1,74 @@
+import threading
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.utils.jwt import decode_access_token
 from jose import JWTError
+from sqlalchemy import event, inspect
 from sqlalchemy.orm import Session
+from app.config import ADMIN_CACHE_TTL_SECONDS, ADMIN_CACHE_MAX_SIZE
 from app.db.session import get_db
 from app.models.login_model import AdminUser
 
 security = HTTPBearer(auto_error=False)
 
+# ---------- admin identity cache ----------
+# token subject (email) -> snapshot of the admin row
+# Each worker only goes to Postgres once per TTL window per admin.
+# cachetools caches are not thread safe and sync handlers run in a thread pool,
+# so every access goes through the lock.
+_admin_cache: TTLCache = TTLCache(
+    maxsize=ADMIN_CACHE_MAX_SIZE,
+    ttl=ADMIN_CACHE_TTL_SECONDS,
+)
+_admin_cache_lock = threading.Lock()
+
+
+def invalidate_admin_cache(email: str | None = None) -> None:
+    """
+    Drop a cached admin (or every admin when email is None).
+    Call this when an admin is deactivated or their role changes.
+    """
+    with _admin_cache_lock:
+        if email is None:
+            _admin_cache.clear()
+        else:
+            _admin_cache.pop(email, None)
+
+
+# Any ORM update/delete of an admin in this process evicts it right away,
+# so deactivation and role changes do not wait for the TTL.
+@event.listens_for(AdminUser, "after_update")
+@event.listens_for(AdminUser, "after_delete")
+def _evict_admin_on_change(mapper, connection, target: AdminUser) -> None:
+    email_history = inspect(target).attrs.email.history
+    for email in [target.email, *(email_history.deleted or ())]:
+        invalidate_admin_cache(email)
+
+
+def _load_admin(db: Session, email: str) -> AdminUser | None:
+    with _admin_cache_lock:
+        cached = _admin_cache.get(email)
+
+    if cached is None:
+        #  Load user from db (source of truth)
+        user = db.query(AdminUser).filter(AdminUser.email == email).first()
+        if not user:
+            return None
+
+        cached = {
+            "id": user.id,
+            "email": user.email,
+            "role": user.role,
+            "is_active": user.is_active,
+        }
+        with _admin_cache_lock:
+            _admin_cache[email] = cached
+
+    # Detached copy: handlers only read id/email/role/is_active
+    return AdminUser(**cached)
+
+
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db),
@@ -23,12 +84,12 @@ def get_current_user(
     # decode and validate JWT token
     try:
         payload = decode_access_token(token)
-    except JWTError:    
+    except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token"
         )
-    
+
     # validate required claims
     email: str | None = payload.get("sub")
     role: str | None = payload.get("role")
@@ -38,29 +99,31 @@ def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or missing claims in token"
         )
-    
-    #  Load user from db (source of truth)
-    user = db.query(AdminUser).filter(AdminUser.email == email).first()
+
+    # Load user from the identity cache (falls back to the db on a miss).
+    # The session only checks out a connection when it runs a query,
+    # so a cache hit never touches the pool.
+    user = _load_admin(db, email)
 
     if not user:
         raise HTTPException(
             status_code = status.HTTP_401_UNAUTHORIZED,
             detail="User not found"
         )
-    
+
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Inactive user",
         )
-    
-    # optional: role verification 
+
+    # optional: role verification
     if user.role != role:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token role mismatch"
         )
-    
+
     return user
 
 
@@ -10,11 +10,70 @@ SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+# SQLAlchemy connection pool (per worker)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 10))  # seconds to wait for a free connection
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))  # seconds before a connection is replaced
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 15000))  # 0 disables it
+DB_APPLICATION_NAME = os.getenv("DB_APPLICATION_NAME", "leafclutch-backend")
+DB_POOL_SLOW_WAIT_MS = int(os.getenv("DB_POOL_SLOW_WAIT_MS", 100))  # log checkouts slower than this
+
+# Per-request query stats (X-DB-Queries / Server-Timing headers). Off by default:
+# the headers tell any caller how much SQL a request ran, turn on for dev/benchmarks
+DB_QUERY_STATS_ENABLED = os.getenv("DB_QUERY_STATS_ENABLED", "false").lower() == "true"
+# Dev/test N+1 guard: fail a request that runs the same statement shape more
+# than this many times (0 = off, keep it off in production)
+DB_QUERY_REPEAT_LIMIT = int(os.getenv("DB_QUERY_REPEAT_LIMIT", 0))
+
+# Async (asyncpg) engine used by the async routers
+# Defaults to DATABASE_URL with the driver swapped to asyncpg
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
+# asyncpg prepared statement cache; set to 0 behind the Supabase transaction pooler (port 6543)
+DB_ASYNC_STATEMENT_CACHE_SIZE = int(os.getenv("DB_ASYNC_STATEMENT_CACHE_SIZE", 100))
+
 # JWT
 JWT_SECRET = os.getenv("JWT_SECRET")
 JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 TOKEN_EXPIRE_MINUTES = int(os.getenv("TOKEN_EXPIRE_MINUTES", 120))
 
+# Admin identity cache (per worker)
+# How long a logged-in admin's active/role state is trusted before re-reading the DB
+ADMIN_CACHE_TTL_SECONDS = int(os.getenv("ADMIN_CACHE_TTL_SECONDS", 60))
+ADMIN_CACHE_MAX_SIZE = int(os.getenv("ADMIN_CACHE_MAX_SIZE", 1024))
+
+# Response cache for the public GET endpoints (per worker)
+RESPONSE_CACHE_TTL_SECONDS = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", 60))
+RESPONSE_CACHE_MAX_SIZE = int(os.getenv("RESPONSE_CACHE_MAX_SIZE", 512))
+
+# Cache-Control for the public catalog (browsers: max-age, CDN/edge: s-maxage)
+PUBLIC_CACHE_MAX_AGE = int(os.getenv("PUBLIC_CACHE_MAX_AGE", 60))
+PUBLIC_CACHE_S_MAXAGE = int(os.getenv("PUBLIC_CACHE_S_MAXAGE", 300))
+PUBLIC_CACHE_STALE_WHILE_REVALIDATE = int(os.getenv("PUBLIC_CACHE_STALE_WHILE_REVALIDATE", 600))
+
+# Cross-worker cache invalidation (Postgres LISTEN/NOTIFY)
+CACHE_BUS_ENABLED = os.getenv("CACHE_BUS_ENABLED", "true").lower() == "true"
+CACHE_BUS_CHANNEL = os.getenv("CACHE_BUS_CHANNEL", "cache_invalidation")
+# LISTEN needs a session-level connection: use the direct/session-mode URL, not the transaction pooler
+CACHE_BUS_DATABASE_URL = os.getenv("CACHE_BUS_DATABASE_URL") or DATABASE_URL
+
+# /health/ready: max time for a pool checkout + SELECT 1
+HEALTH_READY_TIMEOUT_SECONDS = float(os.getenv("HEALTH_READY_TIMEOUT_SECONDS", 2))
+
+# Prometheus-style metrics (text format, NO auth). Off by default: the route is
+# served on the public app port, so only enable it where METRICS_PATH is
+# blocked at the proxy or the port is internal
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "false").lower() == "true"
+METRICS_PATH = os.getenv("METRICS_PATH", "/metrics")
+
+# OpenTelemetry tracing (opt-in)
+TELEMETRY_ENABLED = os.getenv("TELEMETRY_ENABLED", "false").lower() == "true"
+# "console", "file" (JSON lines in TELEMETRY_FILE) or "otlp" (OTEL_EXPORTER_OTLP_ENDPOINT, default localhost:4317)
+TELEMETRY_EXPORTER = os.getenv("TELEMETRY_EXPORTER", "console").lower()
+TELEMETRY_FILE = os.getenv("TELEMETRY_FILE", "traces.jsonl")
+TELEMETRY_SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "leafclutch-backend")
+
 # Cloudinary
 # CLOUDINARY_URL = os.getenv("CLOUDINARY_URL")
 
@@ -24,6 +83,21 @@ APPWRITE_PROJECT_ID = os.getenv("APPWRITE_PROJECT_ID")
 APPWRITE_API_KEY = os.getenv("APPWRITE_API_KEY")
 APPWRITE_BUCKET_ID = os.getenv("APPWRITE_BUCKET_ID")
 
+# Image storage backend: "appwrite" (default) or "local" (files on disk, for dev/load tests)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "appwrite").lower()
+LOCAL_STORAGE_DIR = os.getenv("LOCAL_STORAGE_DIR", "media")
+LOCAL_STORAGE_URL = os.getenv("LOCAL_STORAGE_URL", "/media")  # served by the app when it starts with "/"
+# Where browsers PUT files for direct uploads (app.storage.local_server)
+LOCAL_STORAGE_UPLOAD_URL = os.getenv("LOCAL_STORAGE_UPLOAD_URL", "http://localhost:9000")
+# Lifetime of a signed direct-upload token
+UPLOAD_TOKEN_EXPIRE_SECONDS = int(os.getenv("UPLOAD_TOKEN_EXPIRE_SECONDS", 300))
+# Max uploads talking to the storage backend at the same time (per worker)
+UPLOAD_MAX_CONCURRENCY = int(os.getenv("UPLOAD_MAX_CONCURRENCY", 4))
+
+# Resized variants generated for every uploaded image
+IMAGE_VARIANT_FORMATS = [f.strip() for f in os.getenv("IMAGE_VARIANT_FORMATS", "webp,avif").split(",") if f.strip()]
+IMAGE_PROCESS_WORKERS = int(os.getenv("IMAGE_PROCESS_WORKERS", 2))  # processes used for resizing
+
 # Safety checks (fail fast)
 if not SUPABASE_URL or not SUPABASE_SERVICE_ROLE_KEY:
     raise RuntimeError("Supabase env vars not loaded")
@@ -33,11 +107,17 @@ if not JWT_SECRET:
 
 
 
-# Appwrite for image storage
-if not all([
+# Appwrite for image storage (only needed when it is the storage backend)
+if STORAGE_BACKEND == "appwrite" and not all([
     APPWRITE_ENDPOINT,
     APPWRITE_PROJECT_ID,
     APPWRITE_API_KEY,
     APPWRITE_BUCKET_ID,
 ]):
-    raise RuntimeError("Appwrite env vars not loaded")
\ No newline at end of file
+    raise RuntimeError("Appwrite env vars not loaded")
+
+if TELEMETRY_EXPORTER not in ("console", "file", "otlp"):
+    raise RuntimeError(f"Unknown TELEMETRY_EXPORTER: {TELEMETRY_EXPORTER}")
+
+if STORAGE_BACKEND not in ("appwrite", "local"):
+    raise RuntimeError(f"Unknown STORAGE_BACKEND: {STORAGE_BACKEND}")
@@ -0,0 +1,103 @@
+# Instrumented connection pool
+# Same as SQLAlchemy's QueuePool, but it also measures how long requests
+# wait for a free connection so we can size the pool per worker.
+
+import logging
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.config import DB_POOL_SLOW_WAIT_MS
+
+logger = logging.getLogger(__name__)
+
+
+class PoolWaitStats:
+    """
+    Running totals of connection checkouts for one pool.
+    Updated from many threads, so every write holds the lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def record(self, waited: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait_seconds * 1000 / attempts, 3) if attempts else 0.0,
+                "max_wait_ms": round(self.max_wait_seconds * 1000, 3),
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that times every checkout (including waits for overflow)."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            waited = time.perf_counter() - start
+            self.wait_stats.record(waited, timed_out=True)
+            logger.warning(
+                "DB pool exhausted after %.0f ms (%s)", waited * 1000, self.status()
+            )
+            raise
+
+        waited = time.perf_counter() - start
+        self.wait_stats.record(waited)
+        if waited * 1000 >= DB_POOL_SLOW_WAIT_MS:
+            logger.warning(
+                "Slow DB pool checkout: waited %.0f ms (%s)", waited * 1000, self.status()
+            )
+        return conn
+
+    def recreate(self):
+        # Keep the same stats object when SQLAlchemy rebuilds the pool
+        new_pool = super().recreate()
+        new_pool.wait_stats = self.wait_stats
+        return new_pool
+
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """Same timing for the asyncpg engine (uses the asyncio-friendly queue)."""
+
+
+def pool_stats(pool) -> dict:
+    """
+    Current pool usage: how many connections are in use, how far into
+    overflow we are, and how long checkouts have been waiting.
+    """
+    stats = {
+        "pool_size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(0, pool.overflow()),
+        "max_overflow": pool._max_overflow,
+    }
+    wait_stats = getattr(pool, "wait_stats", None)
+    if wait_stats is not None:
+        stats.update(wait_stats.snapshot())
+    return stats
@@ -0,0 +1,110 @@
+# Per-request SQL statistics and N+1 detection
+# Every statement run on our engines (sync and asyncpg) is counted against
+# the request that caused it. The middleware reports the totals as
+# X-DB-Queries and Server-Timing headers, and in dev/test it can fail a
+# request that keeps running the same statement (the classic N+1).
+
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from sqlalchemy import event
+
+from app.config import DB_QUERY_STATS_ENABLED, DB_QUERY_REPEAT_LIMIT
+
+logger = logging.getLogger(__name__)
+
+QUERY_COUNT_HEADER = "X-DB-Queries"
+
+
+class RepeatedQueryError(RuntimeError):
+    """Raised in dev/test when one statement shape runs too often in a request."""
+
+    def __init__(self, statement: str, count: int):
+        super().__init__(
+            f"Statement ran {count} times in one request (limit {DB_QUERY_REPEAT_LIMIT}), "
+            f"likely an N+1: {statement[:200]}"
+        )
+        self.statement = statement
+        self.count = count
+
+
+class QueryStats:
+    def __init__(self):
+        self.count = 0
+        self.total_seconds = 0.0
+        self.shapes: Counter = Counter()
+
+
+# Set by the middleware; greenlets (asyncpg) and thread-pool routes inherit it
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+_IN_LIST = re.compile(r"\bIN \([^()]*\)", re.IGNORECASE)
+_VALUES_LIST = re.compile(r"\bVALUES (\([^()]*\)(, )?)+", re.IGNORECASE)
+
+
+def statement_shape(statement: str) -> str:
+    # selectinload / bulk inserts expand to one placeholder per row: fold them
+    shape = _IN_LIST.sub("IN (...)", statement)
+    return _VALUES_LIST.sub("VALUES (...)", shape)
+
+
+def current_stats() -> QueryStats | None:
+    return _current.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is None:
+        return
+
+    shape = statement_shape(statement)
+    stats.shapes[shape] += 1
+    if DB_QUERY_REPEAT_LIMIT and stats.shapes[shape] > DB_QUERY_REPEAT_LIMIT:
+        raise RepeatedQueryError(shape, stats.shapes[shape])
+
+    # the execution context lives exactly as long as this statement
+    context._query_stats_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    start = getattr(context, "_query_stats_start", None)
+    if stats is None or start is None:
+        return
+    stats.count += 1
+    stats.total_seconds += time.perf_counter() - start
+
+
+def instrument_engine(sync_engine) -> None:
+    """Count statements on this engine (pass async_engine.sync_engine for asyncpg)."""
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+async def query_stats_middleware(request: Request, call_next):
+    if not DB_QUERY_STATS_ENABLED:
+        return await call_next(request)
+
+    stats = QueryStats()
+    token = _current.set(stats)
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    except RepeatedQueryError as e:
+        logger.error("%s %s: %s", request.method, request.url.path, e)
+        response = JSONResponse(status_code=500, content={"detail": str(e)})
+    finally:
+        _current.reset(token)
+
+    total_ms = (time.perf_counter() - start) * 1000
+    db_ms = stats.total_seconds * 1000
+    response.headers[QUERY_COUNT_HEADER] = str(stats.count)
+    response.headers["Server-Timing"] = (
+        f'db;dur={db_ms:.1f};desc="{stats.count} queries", app;dur={total_ms:.1f}'
+    )
+    return response
@@ -2,10 +2,41 @@
 # Used for models, migrations, and authentication queries
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from app.config import DATABASE_URL
+from app.config import (
+    DATABASE_URL,
+    ASYNC_DATABASE_URL,
+    DB_ASYNC_STATEMENT_CACHE_SIZE,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE,
+    DB_POOL_PRE_PING,
+    DB_STATEMENT_TIMEOUT_MS,
+    DB_APPLICATION_NAME,
+)
+from app.db.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool, pool_stats
+from app.db.query_stats import instrument_engine
 
-engine = create_engine(DATABASE_URL)
+# Server-side settings sent when each connection is opened
+connect_args = {"application_name": DB_APPLICATION_NAME}
+if DB_STATEMENT_TIMEOUT_MS:
+    connect_args["options"] = f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"
+
+# Pool sizing is per worker: total connections = workers * (pool_size + max_overflow)
+engine = create_engine(
+    DATABASE_URL,
+    poolclass=InstrumentedQueuePool,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=DB_POOL_PRE_PING,  # drops connections the pooler closed behind our back
+    connect_args=connect_args,
+)
+instrument_engine(engine)  # per-request query count / DB time
 session_local = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 def get_db():
@@ -13,4 +44,65 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# ---------------- async engine (asyncpg) ----------------
+# Used by the async routers so DB I/O does not block a thread-pool thread.
+
+def _async_database_url() -> str:
+    # Same database as DATABASE_URL, only the driver changes
+    if ASYNC_DATABASE_URL:
+        return ASYNC_DATABASE_URL
+
+    url = make_url(DATABASE_URL).set(drivername="postgresql+asyncpg")
+    query = dict(url.query)
+    # asyncpg calls it "ssl", libpq calls it "sslmode"
+    if "sslmode" in query:
+        query["ssl"] = query.pop("sslmode")
+    if DB_ASYNC_STATEMENT_CACHE_SIZE == 0:
+        # pgbouncer (transaction mode) cannot keep prepared statements
+        query["prepared_statement_cache_size"] = "0"
+    return url.set(query=query).render_as_string(hide_password=False)
+
+
+async_server_settings = {"application_name": DB_APPLICATION_NAME}
+if DB_STATEMENT_TIMEOUT_MS:
+    async_server_settings["statement_timeout"] = str(DB_STATEMENT_TIMEOUT_MS)
+
+async_engine = create_async_engine(
+    _async_database_url(),
+    poolclass=InstrumentedAsyncQueuePool,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=DB_POOL_PRE_PING,
+    connect_args={
+        "server_settings": async_server_settings,
+        "statement_cache_size": DB_ASYNC_STATEMENT_CACHE_SIZE,
+    },
+)
+
+instrument_engine(async_engine.sync_engine)
+
+# expire_on_commit=False: async code cannot lazy-load expired attributes,
+# so objects stay readable after commit (reload explicitly when needed)
+async_session_local = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+async def get_async_db():
+    async with async_session_local() as db:
+        yield db
+
+
+def get_pool_stats() -> dict:
+    # Checked-out, overflow and wait-time stats for this worker's pools
+    return {
+        "sync": pool_stats(engine.pool),
+        "async": pool_stats(async_engine.pool),
+    }
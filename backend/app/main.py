@@ -1,6 +1,9 @@
-from fastapi import FastAPI # The main tool to build the API
+import os
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request # The main tool to build the API
 from dotenv import load_dotenv
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.staticfiles import StaticFiles
 
 from app.auth.router import router as auth_router
 from app.routes.db_health import router as health_router
@@ -13,12 +16,41 @@ from app.routes import projects
 from app.routes import project_feedback
 from app.routes import opportunities
 from app.routes.admin import appwrite_uploads
+from app.config import STORAGE_BACKEND, LOCAL_STORAGE_DIR, LOCAL_STORAGE_URL, METRICS_ENABLED, METRICS_PATH
+from app.db.session import async_engine
+from app.storage import get_storage, close_storage
+from app.storage.variants import shutdown_image_pool
+from app.utils.cache_bus import start_listener, stop_listener
+from app.utils.cache_policy import NO_STORE
+from app.utils.pagination import NEXT_CURSOR_HEADER
+from app.db.query_stats import QUERY_COUNT_HEADER, query_stats_middleware
+from app.telemetry import setup_telemetry, shutdown_telemetry
+from app.metrics import metrics_endpoint, metrics_middleware
 
 
 load_dotenv()
 
+# Startup / shutdown of process-wide resources
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build the storage client (and its connection pool) once per worker
+    get_storage()
+    # Hear about cache invalidations from the other workers
+    start_listener()
+    yield
+    # Close pooled connections and image workers cleanly
+    await stop_listener()
+    await close_storage()
+    shutdown_image_pool()
+    await async_engine.dispose()
+    shutdown_telemetry()
+
+
 # Create the main app
-app = FastAPI(title="Leafclutch backend")
+app = FastAPI(title="Leafclutch backend", lifespan=lifespan)
+
+# Tracing for requests, SQL and outbound HTTP (only if TELEMETRY_ENABLED)
+setup_telemetry(app)
 
 
 # Allow the frontend to talk to the backend (CORS)
@@ -30,8 +62,30 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, QUERY_COUNT_HEADER],  # let the frontend read these
 )
 
+# Anything a route did not give a cache policy for: writes, logged-in
+# requests and errors must never be stored by a browser or CDN
+@app.middleware("http")
+async def default_cache_control(request: Request, call_next):
+    response = await call_next(request)
+    if "cache-control" not in response.headers and (
+        request.method not in ("GET", "HEAD")
+        or "authorization" in request.headers
+        or response.status_code >= 400
+    ):
+        response.headers["Cache-Control"] = NO_STORE
+    return response
+
+
+# Count SQL statements / DB time per request (X-DB-Queries, Server-Timing)
+app.middleware("http")(query_stats_middleware)
+
+# Per-route latency, in-flight requests (outermost, so it times everything)
+app.middleware("http")(metrics_middleware)
+
+
 # Connect all the different route files to the main app
 app.include_router(auth_router)
 app.include_router(training.router)
@@ -46,9 +100,23 @@ app.include_router(opportunities.router)
 app.include_router(appwrite_uploads.router) 
 app.include_router(health_router)
 
+# Direct (signed) uploads need a backend that accepts them: only local storage does
+if STORAGE_BACKEND == "local":
+    app.include_router(appwrite_uploads.direct_router)
+
+# Serve uploaded images ourselves when using the local storage backend
+if STORAGE_BACKEND == "local" and LOCAL_STORAGE_URL.startswith("/"):
+    os.makedirs(LOCAL_STORAGE_DIR, exist_ok=True)
+    app.mount(LOCAL_STORAGE_URL, StaticFiles(directory=LOCAL_STORAGE_DIR), name="media")
+
 
 @app.get("/")
 def health():
     return {"status": "ok"}
 
 
+# Scraped by Prometheus; not in the API docs and not for the public internet
+if METRICS_ENABLED:
+    app.add_api_route(METRICS_PATH, metrics_endpoint, methods=["GET"], include_in_schema=False)
+
+
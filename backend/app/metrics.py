@@ -0,0 +1,230 @@
+# In-process metrics in the Prometheus text exposition format
+# A small registry (counters, gauges, histograms) so we can see request
+# latency per route, pool and thread-pool saturation, upload volume and
+# cache hit ratios without another dependency. Values are per worker
+# process: scrape each worker, or sum them in the query.
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable
+
+import anyio.to_thread
+from fastapi import Request, Response
+
+from app.config import METRICS_ENABLED
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, help: str, labels: tuple = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._values: dict = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    def set(self, value: float, **labels) -> None:
+        # Gauges, and counters owned by a collector (copied from another tally)
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.label_names, key)} {_number(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labels: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            # [count per bucket..., +Inf], sum
+            counts, total = self._values.get(key) or ([0] * (len(self.buckets) + 1), 0.0)
+            counts[bisect_left(self.buckets, value)] += 1
+            self._values[key] = (counts, total + value)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        with self._lock:
+            for key, (counts, total) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += count
+                    le = f'le="{_number(bound)}"'
+                    lines.append(f"{self.name}_bucket{_labels(self.label_names, key, le)} {cumulative}")
+                lines.append(f"{self.name}_sum{_labels(self.label_names, key)} {_number(total)}")
+                lines.append(f"{self.name}_count{_labels(self.label_names, key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: list[_Metric] = []
+        # Called right before rendering, to copy in values owned elsewhere
+        self._collectors: list[Callable[[], None]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def collector(self, fn: Callable[[], None]) -> Callable[[], None]:
+        self._collectors.append(fn)
+        return fn
+
+    def render(self) -> str:
+        for collect in self._collectors:
+            collect()
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+# ---------------- HTTP ----------------
+REQUESTS = registry.register(Counter(
+    "http_requests_total", "Requests handled, by route template and status.", ("method", "route", "status"),
+))
+REQUEST_LATENCY = registry.register(Histogram(
+    "http_request_duration_seconds", "Request latency by route template.", ("method", "route"),
+))
+IN_FLIGHT = registry.register(Gauge(
+    "http_requests_in_flight", "Requests currently being handled.",
+))
+
+# ---------------- DB pool ----------------
+POOL_CHECKED_OUT = registry.register(Gauge(
+    "db_pool_checked_out", "Connections currently in use.", ("engine",),
+))
+POOL_SIZE = registry.register(Gauge(
+    "db_pool_size", "Configured pool size (without overflow).", ("engine",),
+))
+POOL_OVERFLOW = registry.register(Gauge(
+    "db_pool_overflow", "Connections opened beyond pool_size.", ("engine",),
+))
+POOL_TIMEOUTS = registry.register(Counter(
+    "db_pool_checkout_timeouts_total", "Checkouts that gave up waiting for a connection.", ("engine",),
+))
+POOL_MAX_WAIT = registry.register(Gauge(
+    "db_pool_checkout_max_wait_seconds", "Longest wait for a connection so far.", ("engine",),
+))
+
+# ---------------- thread pool (sync routes, to_thread) ----------------
+THREADS_BUSY = registry.register(Gauge(
+    "threadpool_tokens_in_use", "Worker threads busy running sync code.",
+))
+THREADS_TOTAL = registry.register(Gauge(
+    "threadpool_tokens_total", "Size of the worker thread pool.",
+))
+
+# ---------------- uploads / cache ----------------
+UPLOAD_BYTES = registry.register(Counter(
+    "upload_bytes_total", "Image bytes written to storage.", ("kind",),
+))
+CACHE_REQUESTS = registry.register(Counter(
+    "response_cache_requests_total", "Response cache lookups by result.", ("result",),
+))
+
+
+@registry.collector
+def _collect_pools() -> None:
+    from app.db.session import get_pool_stats
+
+    for engine_name, stats in get_pool_stats().items():
+        POOL_CHECKED_OUT.set(stats["checked_out"], engine=engine_name)
+        POOL_SIZE.set(stats["pool_size"], engine=engine_name)
+        POOL_OVERFLOW.set(stats["overflow"], engine=engine_name)
+        POOL_TIMEOUTS.set(stats.get("timeouts", 0), engine=engine_name)
+        POOL_MAX_WAIT.set(stats.get("max_wait_ms", 0.0) / 1000, engine=engine_name)
+
+
+@registry.collector
+def _collect_threadpool() -> None:
+    # Same limiter Starlette uses for sync routes and dependencies
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    THREADS_BUSY.set(limiter.borrowed_tokens)
+    THREADS_TOTAL.set(limiter.total_tokens)
+
+
+@registry.collector
+def _collect_cache() -> None:
+    from app.utils.response_cache import response_cache
+
+    CACHE_REQUESTS.set(response_cache.hits, result="hit")
+    CACHE_REQUESTS.set(response_cache.misses, result="miss")
+
+
+async def metrics_middleware(request: Request, call_next):
+    if not METRICS_ENABLED:
+        return await call_next(request)
+
+    IN_FLIGHT.inc()
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        IN_FLIGHT.dec()
+        # Route template, not the raw path, so IDs do not explode the label set
+        route = request.scope.get("route")
+        route_path = getattr(route, "path", "unmatched")
+        REQUEST_LATENCY.observe(time.perf_counter() - start, method=request.method, route=route_path)
+        REQUESTS.inc(method=request.method, route=route_path, status=status)
+
+
+async def metrics_endpoint() -> Response:
+    # async on purpose: the thread-pool collector must run on the event loop
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
@@ -20,5 +20,7 @@ from app.models.projects.project import Project
 from app.models.projects.feedback import ProjectFeedback
 from app.models.projects.project_tech_map import ProjectTechMap
 
+from app.models.uploads.uploaded_asset import UploadedAsset
+
 # auth models (already working)
 from .login_model import AdminUser
\ No newline at end of file
@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Date, Boolean, DateTime, Enum
+from sqlalchemy import Column, String, Date, Boolean, DateTime, Enum, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from app.db.base import Base
 from .enums import MemberRole
@@ -55,3 +55,16 @@ class Member(Base):
         onupdate=datetime.utcnow,
         nullable=False
     )
+
+    __table_args__ = (
+        # keyset pagination order of the list endpoint
+        Index("ix_members_created_at_id", created_at.desc(), id.desc()),
+        # public team/intern pages: only visible members of one role, newest first
+        Index(
+            "ix_members_visible_role_created_at_id",
+            role,
+            created_at.desc(),
+            id.desc(),
+            postgresql_where=is_visible,
+        ),
+    )
@@ -1,7 +1,8 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, Enum
+from sqlalchemy import Column, String, DateTime, Enum, Index
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship  # needed for ORM navigation
 from app.db.base import Base
 from .enums import OpportunityType
 
@@ -36,3 +37,34 @@ class Opportunity(Base):
         onupdate=datetime.utcnow,
         nullable=False
     )
+
+    __table_args__ = (
+        # keyset pagination order of the list endpoint
+        Index("ix_opportunities_created_at_id", created_at.desc(), id.desc()),
+    )
+
+    # ---------------- ORM RELATIONSHIPS ----------------
+    # allows: opportunity.requirements (in display order)
+    # passive_deletes lets the DB "ON DELETE CASCADE" remove child rows
+    requirements = relationship(
+        "OpportunityRequirement",
+        order_by="OpportunityRequirement.order",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+
+    # allows: opportunity.job_detail (only set for JOB)
+    job_detail = relationship(
+        "JobDetail",
+        uselist=False,
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+
+    # allows: opportunity.internship_detail (only set for INTERNSHIP)
+    internship_detail = relationship(
+        "InternshipDetail",
+        uselist=False,
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, Integer, ForeignKey
+from sqlalchemy import Column, String, Integer, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from app.db.base import Base
 
@@ -24,4 +24,9 @@ class OpportunityRequirement(Base):
     # Requirement text
 
     order = Column(Integer)
+
+    __table_args__ = (
+        # requirements of one opportunity, in display order
+        Index("ix_opportunity_requirements_opportunity_id_order", opportunity_id, order),
+    )
     # Display order
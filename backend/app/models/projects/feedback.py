@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from app.db.base import Base
 
@@ -34,3 +34,8 @@ class ProjectFeedback(Base):
     # Rating between 1 and 5 (validated in logic)
 
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        # feedbacks of one project, newest first
+        Index("ix_project_feedbacks_project_id_created_at", project_id, created_at.desc()),
+    )
@@ -1,7 +1,8 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime
+from sqlalchemy import Column, String, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.orm import relationship  # needed for ORM navigation
 from app.db.base import Base
 
 class Project(Base):
@@ -33,3 +34,26 @@ class Project(Base):
         onupdate=datetime.utcnow,
         nullable=False
     )
+
+    __table_args__ = (
+        # keyset pagination order of the list endpoint
+        Index("ix_projects_created_at_id", created_at.desc(), id.desc()),
+    )
+
+    # ---------------- ORM RELATIONSHIPS ----------------
+    # allows: project.techs
+    # Read-only view over project_tech_map, the routes write the map rows.
+    techs = relationship(
+        "ServiceTech",
+        secondary="project_tech_map",
+        viewonly=True,
+    )
+
+    # allows: project.feedbacks (newest first)
+    # passive_deletes lets the DB "ON DELETE CASCADE" remove the feedbacks
+    feedbacks = relationship(
+        "ProjectFeedback",
+        order_by="ProjectFeedback.created_at.desc()",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
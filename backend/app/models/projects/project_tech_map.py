@@ -1,5 +1,5 @@
 
-from sqlalchemy import Column, ForeignKey
+from sqlalchemy import Column, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from app.db.base import Base
 
@@ -22,3 +22,8 @@ class ProjectTechMap(Base):
         ForeignKey("service_techs.id"),
         primary_key=True,
     )
+
+    __table_args__ = (
+        # the primary key covers project_id; this is for lookups by tech
+        Index("ix_project_tech_map_tech_id", tech_id),
+    )
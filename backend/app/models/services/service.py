@@ -1,7 +1,8 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Numeric, DateTime, Enum
+from sqlalchemy import Column, String, Numeric, DateTime, Enum, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.orm import relationship  # needed for ORM navigation
 from app.db.base import Base
 from app.models.pricing.enums import DiscountType
 from decimal import Decimal
@@ -45,6 +46,27 @@ class Service(Base):
         nullable=False
     )
 
+    __table_args__ = (
+        # keyset pagination order of the list endpoint
+        Index("ix_services_created_at_id", created_at.desc(), id.desc()),
+    )
+
+    # ---------------- ORM RELATIONSHIPS ----------------
+    # allows: service.techs / service.offerings
+    # Read-only views over the map tables, the routes still write the
+    # ServiceTechMap / ServiceOfferingMap rows themselves.
+    techs = relationship(
+        "ServiceTech",
+        secondary="service_tech_map",
+        viewonly=True,
+    )
+
+    offerings = relationship(
+        "ServiceOffering",
+        secondary="service_offering_map",
+        viewonly=True,
+    )
+
     @property
     def effective_price(self):
         """
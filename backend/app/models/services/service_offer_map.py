@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, ForeignKey
+from sqlalchemy import Column, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from app.db.base import Base
 
@@ -8,3 +8,8 @@ class ServiceOfferingMap(Base):
 
     service_id = Column(UUID(as_uuid=True), ForeignKey("services.id"), primary_key=True)
     offering_id = Column(UUID(as_uuid=True), ForeignKey("service_offerings.id"), primary_key=True)
+
+    __table_args__ = (
+        # the primary key covers service_id; this is for lookups by offering
+        Index("ix_service_offering_map_offering_id", offering_id),
+    )
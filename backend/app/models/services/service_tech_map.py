@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, ForeignKey
+from sqlalchemy import Column, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from app.db.base import Base
 
@@ -9,3 +9,8 @@ class ServiceTechMap(Base):
 
     service_id = Column(UUID(as_uuid=True), ForeignKey("services.id"), primary_key=True)
     tech_id = Column(UUID(as_uuid=True), ForeignKey("service_techs.id"), primary_key=True)
+
+    __table_args__ = (
+        # the primary key covers service_id; this is for lookups by tech
+        Index("ix_service_tech_map_tech_id", tech_id),
+    )
@@ -1,6 +1,6 @@
 # placeholder
 import uuid
-from sqlalchemy import Column, String, Integer, ForeignKey
+from sqlalchemy import Column, String, Integer, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship  # needed for ORM navigation
 from app.db.base import Base
@@ -30,6 +30,10 @@ class TrainingBenefit(Base):
     # Used to control display order in UI
     order = Column(Integer)
 
+    __table_args__ = (
+        Index("ix_training_benefits_training_id", training_id),
+    )
+
      # ---------- ORM RELATIONSHIP ----------
     # allows: benefit.training
     # required for training.benefits to work
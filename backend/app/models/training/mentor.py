@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime
+from sqlalchemy import Column, String, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID
 from app.db.base import Base
 
@@ -30,3 +30,8 @@ class Mentor(Base):
         onupdate=datetime.utcnow,
         nullable=False
     )
+
+    __table_args__ = (
+        # mentor list is sorted by name (keyset pagination)
+        Index("ix_mentors_name_id", name, id),
+    )
@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Numeric, DateTime, Enum
+from sqlalchemy import Column, String, Numeric, DateTime, Enum, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship  # needed for ORM navigation
 from app.db.base import Base
@@ -49,6 +49,11 @@ class Training(Base):
         nullable=False
     )
 
+    __table_args__ = (
+        # keyset pagination order of the list endpoint
+        Index("ix_trainings_created_at_id", created_at.desc(), id.desc()),
+    )
+
     # ---------------- ORM RELATIONSHIPS ----------------
     # allows: training.benefits
     benefits = relationship(
@@ -1,5 +1,5 @@
 # placeholder
-from sqlalchemy import Column, Integer, ForeignKey
+from sqlalchemy import Column, Integer, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from app.db.base import Base
 from sqlalchemy.orm import relationship  # needed for ORM navigation
@@ -27,6 +27,11 @@ class TrainingMentor(Base):
     order = Column(Integer)
     # Controls mentor display order per training
 
+    __table_args__ = (
+        # the primary key covers training_id; this is for "which trainings use this mentor"
+        Index("ix_training_mentors_mentor_id", mentor_id),
+    )
+
      # ---------- ORM RELATIONSHIPS ----------
     # allows: training_mentor.training
     training = relationship(
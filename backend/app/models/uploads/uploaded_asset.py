@@ -0,0 +1,33 @@
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, DateTime
+from sqlalchemy.dialects.postgresql import JSONB
+from app.db.base import Base
+
+class UploadedAsset(Base):
+    """
+    One stored image, keyed by the SHA-256 of its bytes.
+    Lets a repeated upload of the same file reuse the stored copy
+    instead of creating a new file in storage.
+    """
+
+    __tablename__ = "uploaded_assets"
+
+    sha256 = Column(String(64), primary_key=True)
+    # Hex digest of the validated upload bytes
+
+    file_id = Column(String, nullable=False)
+    # ID of the original in the storage backend
+
+    url = Column(String, nullable=False)
+    # Public URL of the original
+
+    content_type = Column(String, nullable=False)
+    # Detected image type (from magic bytes)
+
+    size = Column(Integer, nullable=False)
+    # Size of the original in bytes
+
+    variants = Column(JSONB)
+    # Resized copies: {"thumb_webp": url, ...}
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
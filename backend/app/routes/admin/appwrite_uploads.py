@@ -1,15 +1,24 @@
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException
+import asyncio
+import io
+import logging
+import mimetypes
+import os
+import uuid
+from fastapi import APIRouter, BackgroundTasks, Depends, UploadFile, File, HTTPException
+from jose import JWTError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.auth.deps import get_current_user
-from appwrite.client import Client
-from appwrite.services.storage import Storage
-from appwrite.id import ID
-from appwrite.input_file import InputFile
-from app.config import (
-    APPWRITE_API_KEY,
-    APPWRITE_BUCKET_ID,
-    APPWRITE_ENDPOINT,
-    APPWRITE_PROJECT_ID
-)
+from app.db.session import async_session_local, get_async_db
+from app.models.uploads.uploaded_asset import UploadedAsset
+from app.schemas.uploads import UploadSignRequest, UploadSignResponse, UploadCompleteRequest
+from app.utils.jwt import create_upload_token, decode_upload_token
+from app.storage import get_storage
+from app.storage.validation import read_image_upload, sniff_image_type
+from app.storage.variants import ImageProcessingError, build_variants
+from app.metrics import UPLOAD_BYTES
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(
     prefix="/admin/uploads",
@@ -17,59 +26,231 @@ router = APIRouter(
 )
 
 
-
-
-def get_storage() -> Storage:
-    client = Client()
-    client.set_endpoint(APPWRITE_ENDPOINT)
-    client.set_project(APPWRITE_PROJECT_ID)
-    client.set_key(APPWRITE_API_KEY)
-    return Storage(client)
-
 MAX_IMAGE_SIZE = 1_000_000  # 1 MB
+# Types the browser may upload directly (same list the sniffer accepts)
+DIRECT_UPLOAD_TYPES = ("image/jpeg", "image/png", "image/gif", "image/webp", "image/avif")
+
+# Helper function to format an upload for the frontend
+def upload_response(asset: UploadedAsset) -> dict:
+    return {
+        "image_url": asset.url,
+        # e.g. {"thumb_webp": "...", "small_avif": "..."}
+        "variants": asset.variants or {},
+    }
 
 @router.post("/image")
 async def upload_image(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
+    db: AsyncSession = Depends(get_async_db),
     admin = Depends(get_current_user)
 ):
-    if not file.content_type.startswith("image/"):
-        raise HTTPException(status_code=400, detail="Invalid image type")
-    
-    storage = get_storage()
+    # Validate size and real format while reading in chunks
+    # (stops at the first chunk past MAX_IMAGE_SIZE, hashes as it goes)
+    image = await read_image_upload(file, MAX_IMAGE_SIZE)
+
+    # Same bytes uploaded before? Reuse the stored file, skip storage entirely
+    existing = await db.get(UploadedAsset, image.sha256)
+    if existing:
+        response = upload_response(existing)
+        if not existing.variants:
+            # Known file without variants (it came in through /complete, or
+            # its variants failed): build them now that we have the bytes
+            background_tasks.add_task(fill_variants, image.sha256, await file.read(), file.filename)
+        # End the lookup's transaction before the response is sent
+        await db.rollback()
+        return response
+
+    # End the lookup's transaction so no pool connection is held while we
+    # upload; the insert below opens a fresh one
+    await db.rollback()
 
+    # The resize workers run in other processes and need the bytes. Starlette
+    # already spools uploads this small in memory, and read_image_upload
+    # capped them at MAX_IMAGE_SIZE, so this copy is bounded.
+    data = await file.read()
+    await file.seek(0)
+
+    # Step 1: store the original (streams from the upload's temp file).
+    # Appwrite or local disk, depending on STORAGE_BACKEND
     try:
-        # read file bytes
-        file_bytes = await file.read()
-
-        # Validate file size
-        if len(file_bytes) > MAX_IMAGE_SIZE:
-            raise HTTPException(
-                status_code=400,
-                detail="Image too large (max 1MB allowed)"
-            )
-        #  wrap for appwrite
-        input_file = InputFile.from_bytes(
-            file_bytes,
+        stored = await get_storage().save(
+            image.file,
             filename=file.filename,
-            mime_type = file.content_type,
+            content_type=image.content_type,
         )
-        # upload
-        result = storage.create_file(
-            bucket_id=APPWRITE_BUCKET_ID,
-            file_id=ID.unique(),
-            file=input_file,
-        )
-    except HTTPException:
-        raise
     except Exception as e:
-        print("APPWRITE ERROR:", e)
+        logger.exception("Could not store upload %r", file.filename)
         raise HTTPException(status_code=500, detail=str(e))
-    
-    return {
-        "image_url": (
-        f"{APPWRITE_ENDPOINT}/storage/buckets/"
-        f"{APPWRITE_BUCKET_ID}/files/{result['$id']}/view"
-        f"?project={APPWRITE_PROJECT_ID}"
+
+    UPLOAD_BYTES.inc(image.size, kind="original")
+
+    # Step 2: remember the file by its hash so the next duplicate is free
+    asset = UploadedAsset(
+        sha256=image.sha256,
+        file_id=stored.file_id,
+        url=stored.url,
+        content_type=image.content_type,
+        size=image.size,
+        variants={},
     )
-    }
+    db.add(asset)
+    try:
+        await db.commit()
+    except IntegrityError:
+        # Another request stored the same image at the same time: use theirs
+        # (that request builds the variants)
+        await db.rollback()
+        asset = await db.get(UploadedAsset, image.sha256)
+        return upload_response(asset)
+
+    # Step 3: resizing takes seconds, so the variants are built after the
+    # response is sent; until then `variants` is empty and the original is used
+    background_tasks.add_task(fill_variants, image.sha256, data, file.filename)
+    return upload_response(asset)
+
+
+async def fill_variants(sha256: str, data: bytes, filename: str | None) -> None:
+    """
+    Build, store and record the variants of an uploaded image.
+    Runs as a background task after the upload response went out.
+    """
+    # Step 1: build the variants in the process pool (keeps the event loop free)
+    try:
+        variants = await build_variants(data)
+    except ImageProcessingError:
+        logger.warning("Could not build variants for image %s", sha256)
+        return
+
+    # Step 2: store them side by side, in parallel
+    storage = get_storage()
+    stem = os.path.splitext(filename or "image")[0]
+    names = list(variants)
+    try:
+        stored_variants = await asyncio.gather(*[
+            storage.save(
+                io.BytesIO(variant_bytes),
+                filename=f"{stem}-{name}.{content_type.split('/')[1]}",
+                content_type=content_type,
+            )
+            for name, (variant_bytes, content_type) in variants.items()
+        ])
+    except Exception:
+        logger.exception("Could not store variants for image %s", sha256)
+        return
+
+    UPLOAD_BYTES.inc(sum(len(variant_bytes) for variant_bytes, _ in variants.values()), kind="variant")
+
+    # Step 3: record them, unless another upload of the same image got there first
+    async with async_session_local() as db:
+        asset = await db.get(UploadedAsset, sha256)
+        if asset is not None and not asset.variants:
+            asset.variants = {name: variant.url for name, variant in zip(names, stored_variants)}
+            await db.commit()
+
+
+# ================== DIRECT (SIGNED) UPLOADS ==================
+# The browser uploads straight to storage; the API only handles small JSON.
+# 1. Ask for a short-lived upload token  2. PUT the file  3. Call /complete
+# Only the local backend (with app/storage/local_server.py) accepts these
+# uploads, so main.py registers this router only when STORAGE_BACKEND=local.
+# Appwrite has no token that allows creating exactly one file.
+
+direct_router = APIRouter(
+    prefix="/admin/uploads",
+    tags=["Uploads"],
+)
+
+
+@direct_router.post("/sign", response_model=UploadSignResponse)
+async def sign_upload(
+    payload: UploadSignRequest,
+    admin = Depends(get_current_user)
+):
+    # Step 1: Only allowed image types and sizes get a token
+    if payload.content_type not in DIRECT_UPLOAD_TYPES:
+        raise HTTPException(status_code=400, detail="Invalid image type")
+
+    if payload.size is not None and payload.size > MAX_IMAGE_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail="Image too large (max 1MB allowed)"
+        )
+
+    # Step 2: The token is scoped to one new file ID
+    extension = mimetypes.guess_extension(payload.content_type) or ""
+    file_id = f"{uuid.uuid4().hex}{extension}"
+    token, expires_at = create_upload_token(file_id, payload.content_type, MAX_IMAGE_SIZE)
+
+    # Step 3: Tell the browser where to send it
+    target = get_storage().direct_upload_target(file_id, token, payload.content_type)
+
+    return UploadSignResponse(
+        file_id=file_id,
+        token=token,
+        max_size=MAX_IMAGE_SIZE,
+        expires_at=expires_at,
+        **target,
+    )
+
+
+@direct_router.post("/complete")
+async def complete_upload(
+    payload: UploadCompleteRequest,
+    db: AsyncSession = Depends(get_async_db),
+    admin = Depends(get_current_user)
+):
+    # Step 1: The token says which file was uploaded
+    try:
+        claims = decode_upload_token(payload.token)
+    except JWTError:
+        raise HTTPException(status_code=401, detail="Invalid or expired upload token")
+
+    storage = get_storage()
+    file_id = claims["file_id"]
+
+    # Step 2: Check what actually landed in storage
+    stored = await storage.stat(file_id)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="Uploaded file not found")
+
+    if stored.size > claims["max_size"] or sniff_image_type(stored.head) != claims["content_type"]:
+        await storage.delete(file_id)
+        raise HTTPException(status_code=400, detail="Invalid image")
+
+    # Step 3: Same bytes already stored? Keep the old file, drop the new copy
+    existing = await db.get(UploadedAsset, stored.sha256)
+    if existing:
+        response = upload_response(existing)
+        duplicate = existing.file_id != file_id
+        # Release the pool connection before talking to storage
+        await db.rollback()
+        if duplicate:
+            await storage.delete(file_id)
+        return response
+
+    await db.rollback()
+
+    UPLOAD_BYTES.inc(stored.size, kind="direct")
+
+    # Step 4: Record the file (no variants: the bytes never reached this worker;
+    # a later POST /image of the same image builds them)
+    asset = UploadedAsset(
+        sha256=stored.sha256,
+        file_id=file_id,
+        url=storage.url_for(file_id),
+        content_type=claims["content_type"],
+        size=stored.size,
+        variants={},
+    )
+    db.add(asset)
+    try:
+        await db.commit()
+    except IntegrityError:
+        # Same image completed twice at the same time: use the row that won
+        await db.rollback()
+        asset = await db.get(UploadedAsset, stored.sha256)
+        if asset.file_id != file_id:
+            await storage.delete(file_id)
+
+    return upload_response(asset)
@@ -1,5 +1,11 @@
+import asyncio
 from fastapi import APIRouter, Depends, HTTPException # Tools to build the API
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+from app.config import HEALTH_READY_TIMEOUT_SECONDS
+from app.db.pool import pool_stats
 from app.db.supabase import supabase # Connection to Supabase
+from app.db.session import async_engine, get_pool_stats # SQLAlchemy pool usage
 from app.auth.deps import get_current_user # To check if the user is logged in
 
 # Setup the router for health checks
@@ -30,3 +36,49 @@ def check_database_connection(user = Depends(get_current_user)):
                 "error": str(e)
             }
         )
+
+
+# 2. Report how busy the SQLAlchemy connection pool is in this worker
+# Use it to size DB_POOL_SIZE / DB_MAX_OVERFLOW per worker
+@router.get("/db/pool")
+def check_database_pool(user = Depends(get_current_user)):
+    return get_pool_stats()
+
+
+# ================== PROBES (for the orchestrator, no auth) ==================
+
+# 3. Liveness: the process is up and the event loop answers (no I/O at all)
+@router.get("/live")
+async def liveness():
+    return {"status": "ok"}
+
+
+# 4. Readiness: can this worker get a connection from the same pool the
+# routes use and run a query, within a strict timeout?
+@router.get("/ready")
+async def readiness():
+    # Step 1: How busy the pool is right now (before we take a connection)
+    stats = pool_stats(async_engine.pool)
+    capacity = stats["pool_size"] + stats["max_overflow"]
+    pool = {
+        "checked_out": stats["checked_out"],
+        "capacity": capacity,
+        "saturation": round(stats["checked_out"] / capacity, 3) if capacity else 0.0,
+    }
+
+    # Step 2: SELECT 1 through the real pool (checkout wait counts towards the timeout)
+    async def ping():
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    try:
+        await asyncio.wait_for(ping(), timeout=HEALTH_READY_TIMEOUT_SECONDS)
+    except Exception as e:
+        # 503 = take this worker out of rotation until the DB answers again
+        error = "timeout" if isinstance(e, asyncio.TimeoutError) else str(e)
+        return JSONResponse(
+            status_code=503,
+            content={"status": "unavailable", "database": error, "pool": pool},
+        )
+
+    return {"status": "ok", "database": "ok", "pool": pool}
@@ -1,9 +1,10 @@
 import datetime # To handle dates and times
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 
-from app.db.session import get_db
+from app.db.session import get_async_db
 from app.models.member.member import Member
 from app.schemas.members import (
     MemberCreate,
@@ -12,6 +13,9 @@ from app.schemas.members import (
     MemberRole,
 )
 from app.auth.deps import get_current_user # To check if the user is logged in
+from app.utils.cache_bus import invalidate_on_commit
+from app.utils.response_cache import cache_key, json_response, response_cache, serialize
+from app.utils.pagination import CursorParams, fetch_page, newest_first
 
 # Setup the router for all member-related links
 router = APIRouter(prefix="/admin/members", tags=["Members"])
@@ -23,9 +27,9 @@ router = APIRouter(prefix="/admin/members", tags=["Members"])
     response_model=MemberResponse,
     status_code=status.HTTP_201_CREATED,
 )
-def create_member(
+async def create_member(
     payload: MemberCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     admin = Depends(get_current_user),
 ):
     # Step 1: Prepare the member data from the request
@@ -48,66 +52,96 @@ def create_member(
 
     # Save the new member to the database
     db.add(member)
-    db.commit()
-    db.refresh(member)
+    invalidate_on_commit(db, "members")
+    await db.commit()
+    await db.refresh(member)
 
     return member
 
 # 2. Get a list of ALL members
 @router.get("", response_model=list[MemberResponse])
-def list_members(
-    db: Session = Depends(get_db),
+async def list_members(
+    response: Response,
+    params: CursorParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
     
 ):
-    # Step 1: Get every member from the database
-    return db.query(Member).all()
+    # Step 1: Get one page of members (newest first)
+    keyset = newest_first(Member)
+    page = await fetch_page(db, keyset, select(Member), params)
+
+    # The cursor for the next page goes in the X-Next-Cursor header
+    response.headers.update(page.headers())
+    return page.items
 
 # 3. Get only the Team members
 @router.get("/teams", response_model=list[MemberResponse])
-def list_team_members(
-    db: Session = Depends(get_db),
+async def list_team_members(
+    request: Request,
+    params: CursorParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
     
 ):
-    # Step 1: Get only members who are marked as "TEAM" and are visible
-    return (
-        db.query(Member)
-        .filter(
+    # Step 0: Serve the cached JSON if nothing changed since the last call
+    key = cache_key(request)
+    generation = response_cache.generation("members")
+    entry = response_cache.get("members", key)
+    if entry is None:
+        # Step 1: Get only members who are marked as "TEAM" and are visible
+        keyset = newest_first(Member)
+        query = select(Member).where(
             Member.role == MemberRole.TEAM,
             Member.is_visible == True,
         )
-        .all()
-    )
+        page = await fetch_page(db, keyset, query, params)
+        entry = response_cache.set(
+            "members",
+            key,
+            serialize(list[MemberResponse], page.items),
+            headers=page.headers(),
+            generation=generation,
+        )
+    return json_response(request, entry)
 
 # 4. Get only the Interns
 @router.get("/interns", response_model=list[MemberResponse])
-def list_intern_members(
-    db: Session = Depends(get_db),
+async def list_intern_members(
+    request: Request,
+    params: CursorParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
     
 ):
-    # Step 1: Get only members who are marked as "INTERN" and are visible
-    return (
-        db.query(Member)
-        .filter(
+    # Step 0: Serve the cached JSON if nothing changed since the last call
+    key = cache_key(request)
+    generation = response_cache.generation("members")
+    entry = response_cache.get("members", key)
+    if entry is None:
+        # Step 1: Get only members who are marked as "INTERN" and are visible
+        keyset = newest_first(Member)
+        query = select(Member).where(
             Member.role == MemberRole.INTERN,
             Member.is_visible == True,
         )
-        .all()
-    )
+        page = await fetch_page(db, keyset, query, params)
+        entry = response_cache.set(
+            "members",
+            key,
+            serialize(list[MemberResponse], page.items),
+            headers=page.headers(),
+            generation=generation,
+        )
+    return json_response(request, entry)
 
 # 5. Update a member's information
 @router.patch("/{member_id}", response_model=MemberResponse)
-def update_member(
+async def update_member(
     member_id: UUID,
     payload: MemberUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     admin = Depends(get_current_user),
 ):
     # Step 1: Find the member in the database by their ID
-    member = (
-        db.query(Member)
-        .filter(Member.id == member_id)
-        .first()
-    )
+    member = await db.get(Member, member_id)
 
     if not member:
         raise HTTPException(
@@ -125,28 +159,36 @@ def update_member(
     member.updated_at = datetime.datetime.utcnow()
 
     # Step 4: Save changes to the database
-    db.commit()
-    db.refresh(member)
+    invalidate_on_commit(db, "members")
+    await db.commit()
+    await db.refresh(member)
 
     return member
 
 
 # 6. Get details of a specific Team member
 @router.get("/team/{member_id}", response_model=MemberResponse)
-def get_team_member(
+async def get_team_member(
     member_id: UUID,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
    
 ):
+    # Step 0: Serve the cached JSON (answers 304 if the client is up to date)
+    key = cache_key(request)
+    generation = response_cache.generation("members")
+    entry = response_cache.get("members", key)
+    if entry is not None:
+        return json_response(request, entry)
+
     # Step 1: Find the specific team member by their ID
-    member = (
-        db.query(Member)
-        .filter(
+    member = await db.scalar(
+        select(Member)
+        .where(
             Member.id == member_id,
             Member.role == MemberRole.TEAM,
             Member.is_visible == True,
         )
-        .first()
     )
 
     if not member:
@@ -155,24 +197,32 @@ def get_team_member(
             detail="Team member not found",
         )
 
-    return member
+    entry = response_cache.set("members", key, serialize(MemberResponse, member), generation=generation)
+    return json_response(request, entry)
 
 # 7. Get details of a specific Intern
 @router.get("/intern/{member_id}", response_model=MemberResponse)
-def get_intern_member(
+async def get_intern_member(
     member_id: UUID,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
     
 ):
+    # Step 0: Serve the cached JSON (answers 304 if the client is up to date)
+    key = cache_key(request)
+    generation = response_cache.generation("members")
+    entry = response_cache.get("members", key)
+    if entry is not None:
+        return json_response(request, entry)
+
     # Step 1: Find the specific intern by their ID
-    member = (
-        db.query(Member)
-        .filter(
+    member = await db.scalar(
+        select(Member)
+        .where(
             Member.id == member_id,
             Member.role == MemberRole.INTERN,
             Member.is_visible == True,
         )
-        .first()
     )
 
     if not member:
@@ -181,22 +231,19 @@ def get_intern_member(
             detail="Intern not found",
         )
 
-    return member
+    entry = response_cache.set("members", key, serialize(MemberResponse, member), generation=generation)
+    return json_response(request, entry)
 
 
 # 8. Get any member by their ID (Admin only)
 @router.get("/{member_id}", response_model=MemberResponse)
-def get_member_admin(
+async def get_member_admin(
     member_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     
 ):
     # Admin must be able to fetch any member (visible or hidden)
-    member = (
-        db.query(Member)
-        .filter(Member.id == member_id)
-        .first()
-    )
+    member = await db.get(Member, member_id)
 
     if not member:
         raise HTTPException(
@@ -210,17 +257,13 @@ def get_member_admin(
 
 # delete a member by their id
 @router.delete("/{member_id}")
-def delete_member(
+async def delete_member(
     member_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     admin = Depends(get_current_user),
 ):
     # Step 1: Find the member in the database by their ID
-    member = (
-        db.query(Member)
-        .filter(Member.id == member_id)
-        .first()
-    )
+    member = await db.get(Member, member_id)
 
     if not member:
         raise HTTPException(
@@ -229,8 +272,9 @@ def delete_member(
         )
 
     # Step 2: Delete the member from the database
-    db.delete(member)
-    db.commit()
+    await db.delete(member)
+    invalidate_on_commit(db, "members")
+    await db.commit()
 
     return {"message": "Member deleted successfully"}
 
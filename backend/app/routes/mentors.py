@@ -1,9 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status # Tools to build the API
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, status # Tools to build the API
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from uuid import UUID
 
-from app.db.session import get_db
+from app.db.session import get_async_db
 from app.auth.deps import get_current_user # To check if the user is logged in
+from app.utils.cache_bus import invalidate_on_commit
+from app.utils.response_cache import cache_key, json_response, response_cache, serialize
+from app.utils.pagination import CursorParams, Keyset, fetch_page
 from app.models.training.mentor import Mentor
 from app.models.training.training_mentor import TrainingMentor
 from app.schemas.mentor import MentorCreate, MentorUpdate, MentorResponse
@@ -16,34 +21,43 @@ router = APIRouter(
 
 @router.get("/", response_model=list[MentorResponse])
 # 1. Get a list of all mentors
-def list_mentors(
-    db: Session = Depends(get_db),
+async def list_mentors(
+    request: Request,
+    params: CursorParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
     user=Depends(get_current_user),
 ):
-    
-    # Step 1: Get all mentors from the database and sort them by name
-    mentors = (
-        db.query(Mentor)
-        .order_by(Mentor.name.asc())
-        .all()
-    )
-
-    return mentors
+    # Step 0: The dashboard refetches often: answer 304 / cached JSON when unchanged
+    key = cache_key(request)
+    generation = response_cache.generation("mentors")
+    entry = response_cache.get("mentors", key)
+    if entry is None:
+        # Step 1: Get one page of mentors sorted by name
+        # (the training form lists them alphabetically; id breaks ties)
+        keyset = Keyset(columns=(Mentor.name, Mentor.id), descending=False)
+        page = await fetch_page(db, keyset, select(Mentor), params)
+        entry = response_cache.set(
+            "mentors",
+            key,
+            serialize(list[MentorResponse], page.items),
+            headers=page.headers(),
+            generation=generation,
+        )
+    return json_response(request, entry)
 
 @router.post("/", response_model=MentorResponse)
 # 2. Add a new mentor
-def create_mentor(
+async def create_mentor(
     data: MentorCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user=Depends(get_current_user),
 ):
     # Step 1: Clean the name (remove extra spaces and make lowercase)
     name_normalized = data.name.strip().lower()
     # Step 2: Check if the mentor already exists in the database
-    existing = (
-        db.query(Mentor)
-        .filter(Mentor.name.ilike(name_normalized))
-        .first()
+    existing = await db.scalar(
+        select(Mentor)
+        .where(Mentor.name.ilike(name_normalized))
     )
 
     if existing:
@@ -61,8 +75,9 @@ def create_mentor(
 
     # Step 4: Save to database
     db.add(mentor)
-    db.commit()
-    db.refresh(mentor)
+    invalidate_on_commit(db, "mentors")
+    await db.commit()
+    await db.refresh(mentor)
 
     return mentor
 
@@ -70,27 +85,35 @@ def create_mentor(
 # get mentor detail
 @router.get("/{mentor_id}", response_model=MentorResponse)
 # 3. Get details of one specific mentor
-def get_mentor(
+async def get_mentor(
     mentor_id: UUID,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
     user=Depends(get_current_user),
 ):
-    mentor = db.query(Mentor).filter(Mentor.id == mentor_id).first()
+    key = cache_key(request)
+    generation = response_cache.generation("mentors")
+    entry = response_cache.get("mentors", key)
+    if entry is not None:
+        return json_response(request, entry)
+
+    mentor = await db.get(Mentor, mentor_id)
 
     if not mentor:
         raise HTTPException(status_code=404, detail="Mentor not found")
 
-    return mentor
+    entry = response_cache.set("mentors", key, serialize(MentorResponse, mentor), generation=generation)
+    return json_response(request, entry)
 
 @router.put("/{mentor_id}", response_model=MentorResponse)
 # 4. Update a mentor's information
-def update_mentor(
+async def update_mentor(
     mentor_id: UUID,
     data: MentorUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user=Depends(get_current_user),
 ):
-    mentor = db.query(Mentor).filter(Mentor.id == mentor_id).first()
+    mentor = await db.get(Mentor, mentor_id)
 
     if not mentor:
         raise HTTPException(status_code=404, detail="Mentor not found")
@@ -107,17 +130,19 @@ def update_mentor(
             setattr(mentor, field, value)
 
     # Step 2: Save the updates
-    db.commit()
-    db.refresh(mentor)
+    # (cached training lists embed the mentor's name and photo)
+    invalidate_on_commit(db, "mentors", "trainings")
+    await db.commit()
+    await db.refresh(mentor)
 
     return mentor
 
 
 #  delete mentor with proper validation
 @router.delete("/{mentor_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_mentor(
+async def delete_mentor(
     mentor_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user = Depends(get_current_user),
 ):
     """
@@ -125,12 +150,19 @@ def delete_mentor(
     If assigned, returns error with list of training names.
     """
     #  find mentor in db
-    mentor = db.query(Mentor).filter(Mentor.id == mentor_id).first()
+    mentor = await db.get(Mentor, mentor_id)
     if not mentor:
         raise HTTPException(status_code=404, detail="Mentor not found")
     
     # check if mentor is assigned to any training
-    assigned_trainings = db.query(TrainingMentor).filter(TrainingMentor.mentor_id == mentor_id).all()
+    # (training titles are loaded in the same batch, not one query per row)
+    assigned_trainings = (
+        await db.scalars(
+            select(TrainingMentor)
+            .options(selectinload(TrainingMentor.training))
+            .where(TrainingMentor.mentor_id == mentor_id)
+        )
+    ).all()
     # if mentor has training
     if assigned_trainings:
         # get the training names
@@ -145,7 +177,8 @@ def delete_mentor(
         )
     
     #  if not assigned delete mentor
-    db.delete(mentor)
-    db.commit()
+    await db.delete(mentor)
+    invalidate_on_commit(db, "mentors")
+    await db.commit()
 
     return
\ No newline at end of file
@@ -1,8 +1,10 @@
 from uuid import UUID # To handle unique IDs
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
-from app.db.session import get_db
+from app.db.session import get_async_db
 from app.models.opportunities.opportunity import Opportunity
 from app.models.opportunities.job import JobDetail
 from app.models.opportunities.internship import InternshipDetail
@@ -14,6 +16,9 @@ from app.schemas.opportunities import (
     OpportunityResponse,
 )
 from app.auth.deps import get_current_user # To check if the user is logged in
+from app.utils.cache_bus import invalidate_on_commit
+from app.utils.response_cache import cache_key, json_response, response_cache, serialize
+from app.utils.pagination import CursorParams, fetch_page, newest_first
 
 # Setup the router for all job and internship links
 router = APIRouter(
@@ -21,43 +26,46 @@ router = APIRouter(
     tags=["Admin Opportunities"],
 )
 
+# ---------- shared loader (used by CREATE, LIST, GET, UPDATE) ----------
+# Loads opportunities together with requirements and job/internship details.
+# selectinload runs ONE "IN" query per relationship for the whole result,
+# so listing N opportunities costs 4 queries instead of 1 + 3N.
+# populate_existing refreshes objects already in the session (e.g. after an update).
+def opportunity_select():
+    return (
+        select(Opportunity)
+        .options(
+            selectinload(Opportunity.requirements),
+            selectinload(Opportunity.job_detail),
+            selectinload(Opportunity.internship_detail),
+        )
+        .execution_options(populate_existing=True)
+    )
+
+
 # Helper function to format the data for the frontend
+# Only reads already-loaded attributes, so it never touches the database
 def opportunity_response(
     opportunity_obj: Opportunity,
-    db: Session,
 ) -> OpportunityResponse:
-    # Step 1: Get all requirements for this opportunity from the database
-    requirements = (
-        db.query(OpportunityRequirement)
-        .filter_by(opportunity_id=opportunity_obj.id)
-        .order_by(OpportunityRequirement.order)
-        .all()
-    )
-
     job_details = None
     internship_details = None
 
-    # Step 2: If it's a JOB, find its extra details (like salary)
-    if opportunity_obj.type == OpportunityType.JOB:
-        job = db.query(JobDetail).filter_by(
-            opportunity_id=opportunity_obj.id
-        ).first()
-        if job:
-            job_details = {
-                "employment_type": job.employment_type,
-                "salary_range": job.salary_range,
-            }
-
-    # Step 3: If it's an INTERNSHIP, find its extra details (like duration)
-    if opportunity_obj.type == OpportunityType.INTERNSHIP:
-        internship = db.query(InternshipDetail).filter_by(
-            opportunity_id=opportunity_obj.id
-        ).first()
-        if internship:
-            internship_details = {
-                "duration_months": internship.duration_months,
-                "stipend": internship.stipend,
-            }
+    # Step 1: If it's a JOB, add its extra details (like salary)
+    job = opportunity_obj.job_detail
+    if opportunity_obj.type == OpportunityType.JOB and job:
+        job_details = {
+            "employment_type": job.employment_type,
+            "salary_range": job.salary_range,
+        }
+
+    # Step 2: If it's an INTERNSHIP, add its extra details (like duration)
+    internship = opportunity_obj.internship_detail
+    if opportunity_obj.type == OpportunityType.INTERNSHIP and internship:
+        internship_details = {
+            "duration_months": internship.duration_months,
+            "stipend": internship.stipend,
+        }
 
     return OpportunityResponse(
         id=str(opportunity_obj.id),
@@ -68,7 +76,7 @@ def opportunity_response(
         job_details=job_details,
         internship_details=internship_details,
         created_at=opportunity_obj.created_at,
-        requirements=[r.text for r in requirements],
+        requirements=[r.text for r in opportunity_obj.requirements],
     )
 
 
@@ -78,9 +86,9 @@ def opportunity_response(
     status_code=status.HTTP_201_CREATED,
 )
 # 1. Create a new Job or Internship
-def create_opportunity(
+async def create_opportunity(
     payload: OpportunityCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     admin=Depends(get_current_user),
 ):
     # Step 1: Create the main opportunity record
@@ -91,7 +99,7 @@ def create_opportunity(
         type=payload.type,
     )
     db.add(new_opportunity)
-    db.flush()  # This generates the ID so we can use it for the details below
+    await db.flush()  # This generates the ID so we can use it for the details below
 
     # Step 2: Save the extra details based on the type (Job or Internship)
     if payload.type == OpportunityType.JOB:
@@ -122,10 +130,14 @@ def create_opportunity(
             )
         )
 
-    db.commit()
-    db.refresh(new_opportunity)
+    invalidate_on_commit(db, "opportunities")
+    await db.commit()
 
-    return opportunity_response(new_opportunity, db)
+    # Reload with requirements and details in one go
+    new_opportunity = await db.scalar(
+        opportunity_select().where(Opportunity.id == new_opportunity.id)
+    )
+    return opportunity_response(new_opportunity)
 
 
 @router.get(
@@ -133,39 +145,55 @@ def create_opportunity(
     response_model=list[OpportunityResponse],
 )
 # 2. Get a list of all opportunities (with search and filters)
-def list_opportunities(
+async def list_opportunities(
+    request: Request,
     type: OpportunityType | None = None,
     location: str | None = None,
     search: str | None = None,
-    db: Session = Depends(get_db),
+    params: CursorParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
     
 ):
-    # Step 1: Start with a basic query
-    query = db.query(Opportunity)
+    # Step 0: Serve the cached JSON (one entry per filter combination)
+    key = cache_key(request)
+    generation = response_cache.generation("opportunities")
+    entry = response_cache.get("opportunities", key)
+    if entry is not None:
+        return json_response(request, entry)
+
+    # Step 1: Start with a query that batch-loads requirements and details
+    query = opportunity_select()
 
     # Step 2: Add filters if the user provided them in the URL
     if type is not None:
-        query = query.filter(Opportunity.type == type)
+        query = query.where(Opportunity.type == type)
 
     if location:
-        query = query.filter(
+        query = query.where(
             Opportunity.location.ilike(f"%{location}%") # ilike means "search case-insensitive"
         )
 
     if search:
-        query = query.filter(
+        query = query.where(
             Opportunity.title.ilike(f"%{search}%")
         )
 
-    # Step 3: Get the final list, newest first
-    opportunities = query.order_by(
-        Opportunity.created_at.desc()
-    ).all()
-
-    return [
-        opportunity_response(op, db)
-        for op in opportunities
-    ]
+    # Step 3: Get one page, newest first
+    keyset = newest_first(Opportunity)
+    page = await fetch_page(db, keyset, query, params)
+
+    # The cursor for the next page goes in the X-Next-Cursor header
+    entry = response_cache.set(
+        "opportunities",
+        key,
+        serialize(
+            list[OpportunityResponse],
+            [opportunity_response(op) for op in page.items],
+        ),
+        headers=page.headers(),
+        generation=generation,
+    )
+    return json_response(request, entry)
 
 
 @router.get(
@@ -173,15 +201,31 @@ def list_opportunities(
     response_model=OpportunityResponse,
 )
 # 3. Get details of one specific opportunity
-def get_opportunity(
+async def get_opportunity(
     opportunity_id: UUID,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
 ):
-    opportunity_obj = db.get(Opportunity, opportunity_id)
+    # Serve the cached JSON (answers 304 if the client is up to date)
+    key = cache_key(request)
+    generation = response_cache.generation("opportunities")
+    entry = response_cache.get("opportunities", key)
+    if entry is not None:
+        return json_response(request, entry)
+
+    opportunity_obj = await db.scalar(
+        opportunity_select().where(Opportunity.id == opportunity_id)
+    )
     if not opportunity_obj:
         raise HTTPException(status_code=404, detail="Opportunity not found")
 
-    return opportunity_response(opportunity_obj, db)
+    entry = response_cache.set(
+        "opportunities",
+        key,
+        serialize(OpportunityResponse, opportunity_response(opportunity_obj)),
+        generation=generation,
+    )
+    return json_response(request, entry)
 
 
 @router.patch(
@@ -189,13 +233,15 @@ def get_opportunity(
     response_model=OpportunityResponse,
 )
 # 4. Update an existing opportunity
-def update_opportunity(
+async def update_opportunity(
     opportunity_id: UUID,
     payload: OpportunityUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     admin = Depends(get_current_user),
 ):
-    opportunity_obj = db.get(Opportunity, opportunity_id)
+    opportunity_obj = await db.scalar(
+        opportunity_select().where(Opportunity.id == opportunity_id)
+    )
     if not opportunity_obj:
         raise HTTPException(status_code=404, detail="Opportunity not found")
 
@@ -207,39 +253,33 @@ def update_opportunity(
 
     # Step 2: Update the extra details (Job or Internship)
     if opportunity_obj.type == OpportunityType.JOB and payload.job_details:
-        job = db.query(JobDetail).filter_by(
-            opportunity_id=opportunity_obj.id
-        ).first()
+        job = opportunity_obj.job_detail
         if job:
             job.employment_type = payload.job_details.employment_type
             job.salary_range = payload.job_details.salary_range
 
     if opportunity_obj.type == OpportunityType.INTERNSHIP and payload.internship_details:
-        internship = db.query(InternshipDetail).filter_by(
-            opportunity_id=opportunity_obj.id
-        ).first()
+        internship = opportunity_obj.internship_detail
         if internship:
             internship.duration_months = payload.internship_details.duration_months
             internship.stipend = payload.internship_details.stipend
 
     # Step 3: Update requirements (we delete the old ones and add the new ones)
     if payload.requirements is not None:
-        db.query(OpportunityRequirement).filter_by(
-            opportunity_id=opportunity_obj.id
-        ).delete()
-
-        for idx, text in enumerate(payload.requirements):
-            db.add(
-                OpportunityRequirement(
-                    opportunity_id=opportunity_obj.id,
-                    text=text,
-                    order=idx,
-                )
-            )
-
-    db.commit()
-    db.refresh(opportunity_obj)
-    return opportunity_response(opportunity_obj, db)
+        # delete-orphan removes the old rows when the list is replaced
+        opportunity_obj.requirements = [
+            OpportunityRequirement(text=text, order=idx)
+            for idx, text in enumerate(payload.requirements)
+        ]
+
+    invalidate_on_commit(db, "opportunities")
+    await db.commit()
+
+    # Reload with the fresh requirements and details
+    opportunity_obj = await db.scalar(
+        opportunity_select().where(Opportunity.id == opportunity_id)
+    )
+    return opportunity_response(opportunity_obj)
 
 
 @router.delete(
@@ -247,15 +287,16 @@ def update_opportunity(
     status_code=status.HTTP_204_NO_CONTENT,
 )
 # 5. Delete an opportunity
-def delete_opportunity(
+async def delete_opportunity(
     opportunity_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     admin = Depends(get_current_user),
 ):
-    
-    opportunity_obj = db.get(Opportunity, opportunity_id)
+
+    opportunity_obj = await db.get(Opportunity, opportunity_id)
     if not opportunity_obj:
         raise HTTPException(status_code=404, detail="Opportunity not found")
 
-    db.delete(opportunity_obj)
-    db.commit()
+    await db.delete(opportunity_obj)
+    invalidate_on_commit(db, "opportunities")
+    await db.commit()
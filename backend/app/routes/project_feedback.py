@@ -7,6 +7,7 @@ from app.models.projects.project import Project
 from app.models.projects.feedback import ProjectFeedback
 from app.schemas.projects import FeedbackCreate, FeedbackResponse
 from app.auth.deps import get_current_user # To check if the user is logged in
+from app.utils.cache_bus import invalidate_on_commit
 
 # Setup the router for project reviews (feedbacks)
 router = APIRouter(
@@ -50,6 +51,7 @@ def create_project_feedback(
 
     # Step 3: Save to database
     db.add(feedback)
+    invalidate_on_commit(db, "projects")
     db.commit()
     db.refresh(feedback)
 
@@ -113,6 +115,7 @@ def delete_project_feedback(
 
     # Step 2: Delete the review and save changes
     db.delete(feedback)
+    invalidate_on_commit(db, "projects")
     db.commit()
     return
 
@@ -1,23 +1,66 @@
-from fastapi import APIRouter, Depends, HTTPException, status # Tools to build the API
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, status # Tools to build the API
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from uuid import UUID
 
-from app.db.session import get_db
+from app.db.session import get_async_db
 from app.models.projects.project import Project
-from app.models.projects.feedback import ProjectFeedback
 from app.models.projects.project_tech_map import ProjectTechMap
 from app.models.services.service_teck import ServiceTech
 from app.schemas.projects import ProjectCreate, ProjectResponse, ProjectUpdate
 from app.auth.deps import get_current_user # To check if the user is logged in
+from app.utils.cache_bus import invalidate_on_commit
+from app.utils.response_cache import cache_key, json_response, response_cache, serialize
+from app.utils.pagination import CursorParams, fetch_page, newest_first
 
 # Setup the router for all project-related links
 router = APIRouter(prefix="/admin/projects", tags=["Projects"])
 
+# ---------- shared loader (used by CREATE, LIST, GET, UPDATE) ----------
+# Loads projects together with their techs and feedbacks.
+# selectinload runs ONE extra query per relationship for the whole result,
+# so the query count stays flat no matter how many projects there are.
+# populate_existing refreshes objects already in the session (e.g. after an update).
+def project_select():
+    return (
+        select(Project)
+        .options(
+            selectinload(Project.techs),
+            selectinload(Project.feedbacks),
+        )
+        .execution_options(populate_existing=True)
+    )
+
+# ---------- shared api response (used by CREATE, LIST, GET, UPDATE) ----------
+# Helper function to format the project data for the frontend
+def project_response(project: Project) -> ProjectResponse:
+    return ProjectResponse(
+        id=project.id,
+        title=project.title,
+        description=project.description,
+        photo_url=project.photo_url,
+        techs=[tech.name for tech in project.techs],
+        project_link=project.project_link,
+        feedbacks=[
+            {
+                "id": f.id,
+                "client_name": f.client_name,
+                "client_photo": f.client_photo,
+                "feedback_description": f.feedback_description,
+                "rating": f.rating,
+            }
+            for f in project.feedbacks
+        ],
+        created_at=project.created_at,
+        updated_at=project.updated_at,
+    )
+
 # 1. Create a new project
 @router.post("/", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
-def create_project(
+async def create_project(
     payload: ProjectCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     admin = Depends(get_current_user),
 ):
     # Step 1: Create the main project record
@@ -29,14 +72,14 @@ def create_project(
     )
 
     db.add(project)
-    db.flush()  # This generates the ID so we can use it for the mapping below
+    await db.flush()  # This generates the ID so we can use it for the mapping below
 
     # Step 2: Find the technologies in the database
     techs = (
-        db.query(ServiceTech)
-        .filter(ServiceTech.id.in_(payload.tech_ids))
-        .all()
-    )
+        await db.scalars(
+            select(ServiceTech).where(ServiceTech.id.in_(payload.tech_ids))
+        )
+    ).all()
 
     # Step 3: Check if all IDs were valid
     if len(techs) != len(payload.tech_ids):
@@ -54,85 +97,59 @@ def create_project(
             )
         )
     
-    db.commit()
-    db.refresh(project)
+    invalidate_on_commit(db, "projects")
+    await db.commit()
 
-    return ProjectResponse(
-        id=project.id,
-        title=project.title,
-        description=project.description,
-        photo_url=project.photo_url,
-        techs=[tech.name for tech in techs],
-        project_link=project.project_link,
-        feedbacks=[],  # feedbacks are added later
-        created_at=project.created_at,
-        updated_at=project.updated_at,
-    )
+    # Reload with techs (feedbacks are added later, so this list is empty)
+    project = await db.scalar(project_select().where(Project.id == project.id))
+    return project_response(project)
 
 # 2. Get a list of all projects
 @router.get("/", response_model=list[ProjectResponse])
-def list_projects(
-    db: Session = Depends(get_db),
+async def list_projects(
+    request: Request,
+    params: CursorParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
     
 ):
-    # Step 1: Get all projects from the database
-    projects = db.query(Project).all()
-    responses = []
-
-    for project in projects:
-        # Step 2: For each project, find its technology names
-        techs = (
-            db.query(ServiceTech.name)
-            .join(ProjectTechMap, ProjectTechMap.tech_id == ServiceTech.id)
-            .filter(ProjectTechMap.project_id == project.id)
-            .all()
+    # Step 0: Serve the cached JSON if nothing changed since the last call
+    key = cache_key(request)
+    generation = response_cache.generation("projects")
+    entry = response_cache.get("projects", key)
+    if entry is None:
+        # Step 1: Get one page of projects with their techs and feedbacks (3 queries total)
+        keyset = newest_first(Project)
+        page = await fetch_page(db, keyset, project_select(), params)
+
+        # Step 2: Build the response for each project (serialized once, then cached)
+        # The cursor for the next page goes in the X-Next-Cursor header
+        entry = response_cache.set(
+            "projects",
+            key,
+            serialize(list[ProjectResponse], [project_response(project) for project in page.items]),
+            headers=page.headers(),
+            generation=generation,
         )
-
-        # Step 3: Find all reviews (feedbacks) for this project
-        feedbacks = (
-            db.query(ProjectFeedback)
-            .filter(ProjectFeedback.project_id == project.id)
-            .all()
-        )
-
-        # Step 4: Add the project details to the final list
-        responses.append(
-            ProjectResponse(
-                id=project.id,
-                title=project.title,
-                description=project.description,
-                photo_url=project.photo_url,
-                techs=[t[0] for t in techs],
-                project_link=project.project_link,
-                feedbacks=[
-                    {
-                        "id": f.id,
-                        "client_name": f.client_name,
-                        "client_photo": f.client_photo,
-                        "feedback_description": f.feedback_description,
-                        "rating": f.rating,
-                    }
-                    for f in feedbacks
-                ],
-                created_at=project.created_at,
-                updated_at=project.updated_at,
-            )
-        )
-
-    return responses
+    return json_response(request, entry)
 
 # 3. Get details of one specific project
 @router.get("/{project_id}", response_model=ProjectResponse)
-def get_project_detail(
+async def get_project_detail(
     project_id: UUID,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
     
 ):
-    # Step 1: Find the project in the database
-    project = (
-        db.query(Project)
-        .filter(Project.id == project_id)
-        .first()
+    # Step 0: Serve the cached JSON (answers 304 if the client is up to date)
+    key = cache_key(request)
+    generation = response_cache.generation("projects")
+    entry = response_cache.get("projects", key)
+    if entry is not None:
+        return json_response(request, entry)
+
+    # Step 1: Find the project together with its techs and feedbacks
+    project = await db.scalar(
+        project_select().where(Project.id == project_id)
     )
 
     if not project:
@@ -141,56 +158,19 @@ def get_project_detail(
             detail="Project not found",
         )
 
-    # Step 2: Find its technology names
-    techs = (
-        db.query(ServiceTech.name)
-        .join(ProjectTechMap, ProjectTechMap.tech_id == ServiceTech.id)
-        .filter(ProjectTechMap.project_id == project.id)
-        .all()
-    )
-
-    # Step 3: Find its reviews (feedbacks)
-    feedbacks = (
-        db.query(ProjectFeedback)
-        .filter(ProjectFeedback.project_id == project.id)
-        .all()
-    )
-
-    return ProjectResponse(
-        id=project.id,
-        title=project.title,
-        description=project.description,
-        photo_url=project.photo_url,
-        techs=[t[0] for t in techs],
-        project_link=project.project_link,
-        feedbacks=[
-            {
-                "id": f.id,
-                "client_name": f.client_name,
-                "client_photo": f.client_photo,
-                "feedback_description": f.feedback_description,
-                "rating": f.rating,
-            }
-            for f in feedbacks
-        ],
-        created_at=project.created_at,
-        updated_at=project.updated_at,
-    )
+    entry = response_cache.set("projects", key, serialize(ProjectResponse, project_response(project)), generation=generation)
+    return json_response(request, entry)
 
 
 # 4. Update an existing project
 @router.patch("/{project_id}", response_model=ProjectResponse)
-def update_project(
+async def update_project(
     project_id: UUID,
     payload: ProjectUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     admin = Depends(get_current_user),
 ):
-    project = (
-        db.query(Project)
-        .filter(Project.id == project_id)
-        .first()
-    )
+    project = await db.get(Project, project_id)
 
     if not project:
         raise HTTPException(
@@ -209,10 +189,10 @@ def update_project(
     # Step 2: Update the technology list if provided
     if payload.tech_ids is not None:
         techs = (
-            db.query(ServiceTech)
-            .filter(ServiceTech.id.in_(payload.tech_ids))
-            .all()
-        )
+            await db.scalars(
+                select(ServiceTech).where(ServiceTech.id.in_(payload.tech_ids))
+            )
+        ).all()
 
         if len(techs) != len(payload.tech_ids):
             raise HTTPException(
@@ -221,9 +201,9 @@ def update_project(
             )
 
         # Step 3: Remove old links and add new ones
-        db.query(ProjectTechMap).filter(
-            ProjectTechMap.project_id == project.id
-        ).delete()
+        await db.execute(
+            delete(ProjectTechMap).where(ProjectTechMap.project_id == project.id)
+        )
 
         for tech in techs:
             db.add(
@@ -233,56 +213,22 @@ def update_project(
                 )
             )
             
-    db.commit()
-    db.refresh(project)
+    invalidate_on_commit(db, "projects")
+    await db.commit()
 
-    techs = (
-        db.query(ServiceTech.name)
-        .join(ProjectTechMap, ProjectTechMap.tech_id == ServiceTech.id)
-        .filter(ProjectTechMap.project_id == project.id)
-        .all()
-    )
-
-    feedbacks = (
-        db.query(ProjectFeedback)
-        .filter(ProjectFeedback.project_id == project.id)
-        .all()
-    )
-
-    return ProjectResponse(
-        id=project.id,
-        title=project.title,
-        description=project.description,
-        photo_url=project.photo_url,
-        techs=[t[0] for t in techs],
-        project_link=project.project_link,
-        feedbacks=[
-            {
-                "id": f.id,
-                "client_name": f.client_name,
-                "client_photo": f.client_photo,
-                "feedback_description": f.feedback_description,
-                "rating": f.rating,
-            }
-            for f in feedbacks
-        ],
-        created_at=project.created_at,
-        updated_at=project.updated_at,
-    )
+    # Step 4: Reload with the new techs and current feedbacks
+    project = await db.scalar(project_select().where(Project.id == project_id))
+    return project_response(project)
 
 # 5. Delete a project
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_project(
+async def delete_project(
     project_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     admin = Depends(get_current_user),
 ):
     # Step 1: Find the project in the database
-    project = (
-        db.query(Project)
-        .filter(Project.id == project_id)
-        .first()
-    )
+    project = await db.get(Project, project_id)
 
     if not project:
         raise HTTPException(
@@ -291,12 +237,13 @@ def delete_project(
         )
 
     # Step 2: Remove the links to technologies first
-    db.query(ProjectTechMap).filter(
-        ProjectTechMap.project_id == project_id
-    ).delete()
+    await db.execute(
+        delete(ProjectTechMap).where(ProjectTechMap.project_id == project_id)
+    )
 
     # Step 3: Delete the project (reviews are deleted automatically)
-    db.delete(project)
-    db.commit()
+    await db.delete(project)
+    invalidate_on_commit(db, "projects")
+    await db.commit()
 
     return
@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status # Tools to build the API
+from fastapi import APIRouter, Depends, HTTPException, Request, status # Tools to build the API
 from sqlalchemy.orm import Session
 from uuid import UUID
 
 from app.db.session import get_db
 from app.auth.deps import get_current_user # To check if the user is logged in
+from app.utils.cache_bus import invalidate_on_commit
+from app.utils.response_cache import cache_key, json_response, response_cache, serialize
 from app.models.services.service_teck import ServiceTech
 from app.models.services.service_tech_map import ServiceTechMap
 from app.schemas.service_tech import (
@@ -46,6 +48,7 @@ def create_service_tech(
 
     # Step 3: Save to database
     db.add(tech)
+    invalidate_on_commit(db, "service_techs")
     db.commit()
     db.refresh(tech)
 
@@ -54,11 +57,19 @@ def create_service_tech(
 # 2. Get a list of all technologies
 @router.get("", response_model=list[ServiceTechResponse])
 def list_service_techs(
+    request: Request,
     db: Session = Depends(get_db),
     
 ):
-    # Simple list for admin selection
-    return db.query(ServiceTech).all()
+    # Serve the cached JSON if nothing changed since the last call
+    key = cache_key(request)
+    generation = response_cache.generation("service_techs")
+    entry = response_cache.get("service_techs", key)
+    if entry is None:
+        # Simple list for admin selection
+        techs = db.query(ServiceTech).all()
+        entry = response_cache.set("service_techs", key, serialize(list[ServiceTechResponse], techs), generation=generation)
+    return json_response(request, entry)
 
 
 # 3. Delete a technology with validation
@@ -91,6 +102,7 @@ def delete_service_tech(
     
     # If not used, safe to delete
     db.delete(tech)
+    invalidate_on_commit(db, "service_techs")
     db.commit()
     
     return
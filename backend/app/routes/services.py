@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status # Tools to build the API
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, status # Tools to build the API
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from uuid import UUID
 
-from app.db.session import get_db
+from app.db.session import get_async_db
 from app.models.services.service import Service
 from app.models.services.service_teck import ServiceTech
 from app.models.services.service_tech_map import ServiceTechMap
@@ -10,15 +12,50 @@ from app.models.services.service_offer import ServiceOffering
 from app.models.services.service_offer_map import ServiceOfferingMap
 from app.schemas.Services import ServiceCreate, ServiceResponse, ServiceUpdate
 from app.auth.deps import get_current_user # To check if the user is logged in
+from app.utils.cache_bus import invalidate_on_commit
+from app.utils.response_cache import cache_key, json_response, response_cache, serialize
+from app.utils.pagination import CursorParams, fetch_page, newest_first
 
 # Setup the router for all service-related links
 router = APIRouter(prefix="/admin/services", tags=["Services"])
 
+# ---------- shared loader (used by CREATE, LIST, GET, UPDATE) ----------
+# Loads services together with their techs and offerings.
+# selectinload runs ONE extra query per relationship for the whole result,
+# so listing 200 services costs 3 queries instead of 401.
+# populate_existing refreshes objects already in the session (e.g. after an update).
+def service_select():
+    return (
+        select(Service)
+        .options(
+            selectinload(Service.techs),
+            selectinload(Service.offerings),
+        )
+        .execution_options(populate_existing=True)
+    )
+
+# ---------- shared api response (used by CREATE, LIST, GET, UPDATE) ----------
+# Helper function to format the service data for the frontend
+def service_response(service: Service) -> ServiceResponse:
+    # Explicit response to avoid leaking DB structure
+    return ServiceResponse(
+        id=service.id,
+        title=service.title,
+        description=service.description,
+        photo_url=service.photo_url,
+        techs=[tech.name for tech in service.techs],
+        offerings=[offering.name for offering in service.offerings],
+        base_price=service.base_price,
+        effective_price=service.effective_price,
+        created_at=service.created_at,
+        updated_at=service.updated_at,
+    )
+
 # 1. Create a new service
 @router.post("/", response_model=ServiceResponse, status_code=status.HTTP_201_CREATED)
-def create_service(
+async def create_service(
    payload: ServiceCreate,
-   db: Session = Depends(get_db),
+   db: AsyncSession = Depends(get_async_db),
    admin = Depends(get_current_user),
 ):
      # Step 1: Create the main service record
@@ -27,34 +64,33 @@ def create_service(
         description=payload.description,
         photo_url=payload.photo_url,
         base_price=payload.base_price,
-        enroll_from_price=payload.enroll_from_price,
         discount_type=payload.discount_type,
         discount_value=payload.discount_value,
     )
     # Step 2: Save it temporarily to get an ID
     db.add(service)
-    db.flush() # ensures service.id exists before mapping
+    await db.flush() # ensures service.id exists before mapping
 
     # Step 3: Find and check the technologies
     techs = (
-        db.query(ServiceTech).filter(ServiceTech.id.in_(payload.tech_ids)).all()
-    )
+        await db.scalars(select(ServiceTech).where(ServiceTech.id.in_(payload.tech_ids)))
+    ).all()
     if len(techs) != len(payload.tech_ids):
         raise HTTPException(
             status_code=400,
             detail="One or more tech IDs are invalid",
         )
-    
+
     # Step 4: Find and check the offerings
     offerings = (
-        db.query(ServiceOffering).filter(ServiceOffering.id.in_(payload.offering_ids)).all()
-    )
+        await db.scalars(select(ServiceOffering).where(ServiceOffering.id.in_(payload.offering_ids)))
+    ).all()
     if len(offerings) != len(payload.offering_ids):
         raise HTTPException(
             status_code=400,
             detail="One or more offering IDs are invalid",
         )
-    
+
     # Step 5: Link the service to the technologies and offerings
     for tech in techs:
         db.add(
@@ -71,85 +107,64 @@ def create_service(
                 offering_id=offering.id,
             )
         )
-    
+
+    invalidate_on_commit(db, "services")
     # Commit once to keep write atomic
-    db.commit()
-    db.refresh(service)
+    await db.commit()
 
-    # Explicit response to avoid leaking DB structure
-    return ServiceResponse(
-        id=service.id,
-        title=service.title,
-        description=service.description,
-        photo_url=service.photo_url,
-        techs=[tech.name for tech in techs],
-        offerings=[offering.name for offering in offerings],
-        base_price=service.base_price,
-        effective_price=service.effective_price,
-        created_at=service.created_at,
-        updated_at=service.updated_at,
-    )
+    # Reload with techs and offerings in one go
+    service = await db.scalar(service_select().where(Service.id == service.id))
+    return service_response(service)
 
 # List all services with their tech stacks and offerings
 # 2. Get a list of all services
 @router.get("/", response_model=list[ServiceResponse])
-def list_services(
-    db: Session = Depends(get_db),
-    
-):
-    # Step 1: Get all services from the database
-    services = db.query(Service).all()
-    responses = []
-
-    for service in services:
-        # Step 2: For each service, find its technology names
-        techs = (
-            db.query(ServiceTech.name)
-            .join(ServiceTechMap)
-            .filter(ServiceTechMap.service_id == service.id)
-            .all()
-        )
+async def list_services(
+    request: Request,
+    params: CursorParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
 
-        # Step 3: Find all features (offerings) for this service
-        offerings = (
-            db.query(ServiceOffering.name)
-            .join(ServiceOfferingMap)
-            .filter(ServiceOfferingMap.service_id == service.id)
-            .all()
-        )
-
-        # Step 4: Add the service details to the final list
-        responses.append(
-            ServiceResponse(
-                id=service.id,
-                title=service.title,
-                description=service.description,
-                photo_url=service.photo_url,
-                techs=[t[0] for t in techs],
-                offerings=[o[0] for o in offerings],
-                base_price=service.base_price,
-                effective_price=service.effective_price,
-                created_at=service.created_at,
-                updated_at=service.updated_at,
-            )
+):
+    # Step 0: Serve the cached JSON if nothing changed since the last call
+    key = cache_key(request)
+    generation = response_cache.generation("services")
+    entry = response_cache.get("services", key)
+    if entry is None:
+        # Step 1: Get one page of services with their techs and offerings (3 queries total)
+        keyset = newest_first(Service)
+        page = await fetch_page(db, keyset, service_select(), params)
+
+        # Step 2: Build the response for each service (serialized once, then cached)
+        # The cursor for the next page goes in the X-Next-Cursor header
+        entry = response_cache.set(
+            "services",
+            key,
+            serialize(list[ServiceResponse], [service_response(service) for service in page.items]),
+            headers=page.headers(),
+            generation=generation,
         )
-
-    return responses
+    return json_response(request, entry)
 
 
 # get service details by id
 # 3. Get details of one specific service
 @router.get("/{service_id}", response_model=ServiceResponse)
-def get_service(
+async def get_service(
     service_id: UUID,
-    db: Session = Depends(get_db),
-    
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+
 ):
-    # Step 1: Find the service in the database
-    service = (
-        db.query(Service)
-        .filter(Service.id == service_id)
-        .first()
+    # Step 0: Serve the cached JSON (answers 304 if the client is up to date)
+    key = cache_key(request)
+    generation = response_cache.generation("services")
+    entry = response_cache.get("services", key)
+    if entry is not None:
+        return json_response(request, entry)
+
+    # Step 1: Find the service together with its techs and offerings
+    service = await db.scalar(
+        service_select().where(Service.id == service_id)
     )
 
     if not service:
@@ -158,50 +173,20 @@ def get_service(
             detail="Service not found",
         )
 
-    # Step 2: Find its technology names
-    techs = (
-        db.query(ServiceTech.name)
-        .join(ServiceTechMap)
-        .filter(ServiceTechMap.service_id == service.id)
-        .all()
-    )
-
-    # Step 3: Find its features (offerings)
-    offerings = (
-        db.query(ServiceOffering.name)
-        .join(ServiceOfferingMap)
-        .filter(ServiceOfferingMap.service_id == service.id)
-        .all()
-    )
-
-    return ServiceResponse(
-        id=service.id,
-        title=service.title,
-        description=service.description,
-        photo_url=service.photo_url,
-        techs=[t[0] for t in techs],
-        offerings=[o[0] for o in offerings],
-        base_price=service.base_price,
-        effective_price=service.effective_price,
-        created_at=service.created_at,
-        updated_at=service.updated_at,
-    )
+    entry = response_cache.set("services", key, serialize(ServiceResponse, service_response(service)), generation=generation)
+    return json_response(request, entry)
 
 
 # 4. Update an existing service
 @router.patch("/{service_id}", response_model=ServiceResponse)
-def update_service(
+async def update_service(
     service_id: UUID,
     payload: ServiceUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     admin = Depends(get_current_user),
 ):
     # Fetch service or fail fast
-    service = (
-        db.query(Service)
-        .filter(Service.id == service_id)
-        .first()
-    )
+    service = await db.get(Service, service_id)
 
     if not service:
         raise HTTPException(
@@ -217,17 +202,17 @@ def update_service(
     # Step 2: Update the technology list if provided
     if payload.tech_ids is not None:
         # Clear existing tech relations
-        db.query(ServiceTechMap).filter(
-            ServiceTechMap.service_id == service.id
-        ).delete()
+        await db.execute(
+            delete(ServiceTechMap).where(ServiceTechMap.service_id == service.id)
+        )
 
         # Empty list means clear all
         if payload.tech_ids:
             techs = (
-                db.query(ServiceTech)
-                .filter(ServiceTech.id.in_(payload.tech_ids))
-                .all()
-            )
+                await db.scalars(
+                    select(ServiceTech).where(ServiceTech.id.in_(payload.tech_ids))
+                )
+            ).all()
 
             if len(techs) != len(payload.tech_ids):
                 raise HTTPException(
@@ -245,16 +230,16 @@ def update_service(
     # Step 3: Update the offerings list if provided
     if payload.offering_ids is not None:
         # Clear existing offering relations
-        db.query(ServiceOfferingMap).filter(
-            ServiceOfferingMap.service_id == service.id
-        ).delete()
+        await db.execute(
+            delete(ServiceOfferingMap).where(ServiceOfferingMap.service_id == service.id)
+        )
 
         if payload.offering_ids:
             offerings = (
-                db.query(ServiceOffering)
-                .filter(ServiceOffering.id.in_(payload.offering_ids))
-                .all()
-            )
+                await db.scalars(
+                    select(ServiceOffering).where(ServiceOffering.id.in_(payload.offering_ids))
+                )
+            ).all()
 
             if len(offerings) != len(payload.offering_ids):
                 raise HTTPException(
@@ -269,62 +254,40 @@ def update_service(
                         offering_id=offering.id,
                     )
                 )
-    db.commit()
-    db.refresh(service)
-
-    techs = (
-        db.query(ServiceTech.name)
-        .join(ServiceTechMap)
-        .filter(ServiceTechMap.service_id == service.id)
-        .all()
-    )
+    invalidate_on_commit(db, "services")
+    await db.commit()
 
-    offerings = (
-        db.query(ServiceOffering.name)
-        .join(ServiceOfferingMap)
-        .filter(ServiceOfferingMap.service_id == service.id)
-        .all()
-    )
-
-    return ServiceResponse(
-        id=service.id,
-        title=service.title,
-        description=service.description,
-        photo_url=service.photo_url,
-        techs=[t[0] for t in techs],
-        offerings=[o[0] for o in offerings],
-        base_price=service.base_price,
-        effective_price=service.effective_price,
-        created_at=service.created_at,
-        updated_at=service.updated_at,
-    )
+    # Step 4: Reload with the new techs and offerings
+    service = await db.scalar(service_select().where(Service.id == service_id))
+    return service_response(service)
 
 
 # 5. Delete a service
 @router.delete("/{service_id}")
-def delete_service(
+async def delete_service(
     service_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     admin = Depends(get_current_user),
 ):
     # Step 1: Find the service in the database
-    service = db.query(Service).filter(Service.id == service_id).first()
+    service = await db.get(Service, service_id)
 
     if not service:
         raise HTTPException(status_code=404, detail="Service not found")
 
     # Step 2: Remove the links to technologies and features first
-    db.query(ServiceTechMap).filter(
-        ServiceTechMap.service_id == service_id
-    ).delete()
+    await db.execute(
+        delete(ServiceTechMap).where(ServiceTechMap.service_id == service_id)
+    )
 
-    db.query(ServiceOfferingMap).filter(
-        ServiceOfferingMap.service_id == service_id
-    ).delete()
+    await db.execute(
+        delete(ServiceOfferingMap).where(ServiceOfferingMap.service_id == service_id)
+    )
 
     # Step 3: Delete the service and save changes
-    db.delete(service)
-    db.commit()
+    await db.delete(service)
+    invalidate_on_commit(db, "services")
+    await db.commit()
 
     return {"message": "Service deleted successfully", "id": service_id}
 
@@ -1,8 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, Query # Tools to build the API
-from app.db.session import get_db
-from sqlalchemy.orm import Session, selectinload
+from fastapi import APIRouter, Depends, HTTPException, Request # Tools to build the API
+from app.db.session import get_async_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from app.schemas.training import TrainingCreate, TrainingUpdate, TrainingResponse, MentorResponse
 from app.auth.deps import get_current_user # To check if the user is logged in
+from app.utils.cache_bus import invalidate_on_commit
+from app.utils.response_cache import cache_key, json_response, response_cache, serialize
+from app.utils.pagination import EXACT_TOTAL, CursorParams, fetch_page, newest_first
 from typing import List
 from decimal import Decimal
 from app.models.training.training import Training
@@ -56,12 +61,43 @@ def training_response(training:Training)->TrainingResponse:
         updated_at=training.updated_at,
     )
 
+# ---------- shared loader (used by CREATE, LIST, GET, UPDATE) ----------
+# Async sessions cannot lazy-load, so every relation the response reads is loaded here.
+# populate_existing refreshes objects already in the session (e.g. after an update).
+def training_select():
+    return (
+        select(Training)
+        .options(
+            selectinload(Training.benefits),          # load benefits
+            selectinload(Training.training_mentors)   # load mentors join
+            .selectinload(TrainingMentor.mentor),     # load mentor itself
+        )
+        .execution_options(populate_existing=True)
+    )
+
+# Helper function to check that every mentor ID exists (one query for all of them)
+async def load_mentors(db: AsyncSession, mentor_ids: List[UUID]) -> List[Mentor]:
+    mentors = (
+        await db.scalars(select(Mentor).where(Mentor.id.in_(mentor_ids)))
+    ).all()
+    found = {mentor.id: mentor for mentor in mentors}
+
+    for mentor_id in mentor_ids:
+        if mentor_id not in found:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Mentor {mentor_id} does not exist",
+            )
+
+    # keep the order the admin sent
+    return [found[mentor_id] for mentor_id in mentor_ids]
+
 # ==================  Crud operations ======================#
 # 1. Create a new training course
 @router.post("/", response_model=TrainingResponse)
-def create_training(
+async def create_training(
     data: TrainingCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user=Depends(get_current_user)
 ):
     # Step 1: Create the main training record
@@ -75,7 +111,7 @@ def create_training(
         discount_value=data.discount_value,
     )
     db.add(training)
-    db.flush()  # Get the ID for the next steps
+    await db.flush()  # Get the ID for the next steps
 
     # Step 2: Add the benefits list
     for benefit_text in data.benefits:
@@ -87,15 +123,7 @@ def create_training(
         )
 
     # Step 3: Link the mentors to this training
-    for mentor_id in data.mentor_ids:
-        mentor = db.query(Mentor).filter(Mentor.id == mentor_id).first()
-
-        if not mentor:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Mentor {mentor_id} does not exist",
-            )
-
+    for mentor in await load_mentors(db, data.mentor_ids):
         db.add(
             TrainingMentor(
                 training_id=training.id,
@@ -104,94 +132,94 @@ def create_training(
         )
 
     # ✅ commit ONCE
-    db.commit()
+    invalidate_on_commit(db, "trainings")
+    await db.commit()
 
-    # ✅ refresh AFTER commit
-    db.refresh(training)
+    # ✅ reload AFTER commit (with benefits and mentors)
+    training = await db.scalar(training_select().where(Training.id == training.id))
 
     # ✅ ALWAYS return
     return training_response(training)
 
 
 # ================== LIST TRAININGS ==================
-# 2. Get a list of all training courses (with pagination)
+# 2. Get a list of all training courses (with cursor pagination)
 @router.get("/", response_model=dict)
-def list_trainings(
-    page: int = Query(1, ge=1),          # 1-based pagination
-    page_size: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db),
-    
+async def list_trainings(
+    request: Request,
+    params: CursorParams = Depends(),    # ?limit=&cursor= (next_cursor from the last page)
+    db: AsyncSession = Depends(get_async_db),
+
 ):
-    # Step 1: Count the total number of training courses
-    total = db.query(Training).count()
-    # Step 2: Get the list of courses for the current page
-    trainings = (
-        db.query(Training).options(
-            selectinload(Training.benefits),          # load benefits
-            selectinload(Training.training_mentors)   # load mentors join
-            .selectinload(TrainingMentor.mentor)      # load mentor itself
-        )
-        .order_by(Training.created_at.desc())
-        .offset((page - 1)* page_size)
-        .limit(page_size)
-        .all()
-    )
+    # Step 0: Serve the cached JSON (one entry per page)
+    key = cache_key(request)
+    generation = response_cache.generation("trainings")
+    entry = response_cache.get("trainings", key)
+    if entry is not None:
+        return json_response(request, entry)
+
+    # Step 1: Get the courses after the cursor (no OFFSET scan, same speed on every page)
+    # and the total number of courses from the same statement (count(*) OVER ())
+    keyset = newest_first(Training)
+    page = await fetch_page(db, keyset, training_select(), params, total=EXACT_TOTAL)
     # build response
-    items = [training_response(t) for t in trainings]
-    return {
-        "items":items,
-        "page": page,
-        "page_size": page_size,
-        "total": total,
-    }
+    items = [training_response(t) for t in page.items]
+    entry = response_cache.set(
+        "trainings",
+        key,
+        serialize(dict, {
+            "items":items,
+            "limit": params.limit,
+            "next_cursor": page.next_cursor,
+            "total": page.total,
+        }),
+        generation=generation,
+    )
+    return json_response(request, entry)
+
 
-    
 
 # 3. Get details of one specific training course
 @router.get("/{training_id}", response_model=TrainingResponse)
-def get_training_detail(training_id: UUID, db: Session =Depends(get_db)):
+async def get_training_detail(training_id: UUID, request: Request, db: AsyncSession = Depends(get_async_db)):
+    # Step 0: Serve the cached JSON (answers 304 if the client is up to date)
+    key = cache_key(request)
+    generation = response_cache.generation("trainings")
+    entry = response_cache.get("trainings", key)
+    if entry is not None:
+        return json_response(request, entry)
+
     # Step 1: Find the training course in the database
-    training = (
-        db.query(Training)
-        .options(
-            selectinload(Training.benefits),                # load benefits
-            selectinload(Training.training_mentors)
-            .selectinload(TrainingMentor.mentor),           # load mentors
-        )
-        .filter(Training.id == training_id).first()
+    training = await db.scalar(
+        training_select().where(Training.id == training_id)
     )
     if not training:
         raise HTTPException(status_code=404, detail="Training program not found")
-    return training_response(training)
+    entry = response_cache.set("trainings", key, serialize(TrainingResponse, training_response(training)), generation=generation)
+    return json_response(request, entry)
 
 # ================== UPDATE TRAINING ==================
 
 # 4. Update an existing training course
 @router.put("/{training_id}", response_model=TrainingResponse)
-def update_training(
+async def update_training(
     training_id: UUID,
     data: TrainingUpdate,
-    db:Session= Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user = Depends(get_current_user),
 ):
     # load training with relations
-    training = (
-        db.query(Training)
-        .options(
-            selectinload(Training.benefits),
-            selectinload(Training.training_mentors),
-        )
-        .filter(Training.id == training_id)
-        .first()
+    training = await db.scalar(
+        training_select().where(Training.id == training_id)
     )
 
     if not training:
         raise HTTPException(status_code=404, detail="Training not found")
-    
+
      # Step 1: Update basic fields
     # Use model_dump(exclude_unset=True) to only update fields that were sent
     update_data = data.model_dump(exclude_unset=True)
-    
+
     for field, value in update_data.items():
         # Skip list fields (handled separately below)
         if field not in ["benefits", "mentor_ids"]:
@@ -199,50 +227,51 @@ def update_training(
 
     # Step 2: Replace the benefits list
     if data.benefits is not None:
-        training.benefits.clear() 
+        training.benefits.clear()
         for benefit_text in data.benefits:
             training.benefits.append(
                 TrainingBenefit(text=benefit_text)
             )
-    
+
     # Step 3: Replace the mentors list
     if data.mentor_ids is not None:
-        training.training_mentors.clear() 
+        mentors = await load_mentors(db, data.mentor_ids)
+        training.training_mentors.clear()
 
-        for mentor_id in data.mentor_ids:
-            mentor = db.query(Mentor).filter(Mentor.id == mentor_id).first()
-
-            if not mentor:
-                raise HTTPException(400, f"Mentor {mentor_id} does not exist")
-        
-            
+        for mentor in mentors:
             training.training_mentors.append(
                 TrainingMentor(mentor_id=mentor.id)
             )
      # single commit = atomic update
-    db.commit()
-    db.refresh(training)
+    invalidate_on_commit(db, "trainings")
+    await db.commit()
+
+    # reload so the response sees the new mentors
+    training = await db.scalar(
+        training_select().where(Training.id == training_id)
+    )
 
     return training_response(training)
-    
+
 
 # 5. Delete a training course
 @router.delete("/{training_id}", status_code=204)
-def delete_training(
+async def delete_training(
     training_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user=Depends(get_current_user),
 ):
     # Step 1: Find the training course in the database
-    training = db.query(Training).filter(Training.id == training_id).first()
+    training = await db.get(Training, training_id)
 
     if not training:
         raise HTTPException(status_code=404, detail="Training not found")
-    
+
     # Step 2: Delete the course and save changes
-    db.delete(training)
-    db.commit()
+    # (AsyncSession.delete loads the benefits/mentor links it cascades to)
+    await db.delete(training)
+    invalidate_on_commit(db, "trainings")
+    await db.commit()
 
     # 204 = success, no response body
     return
-    
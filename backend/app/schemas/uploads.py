@@ -0,0 +1,26 @@
+from datetime import datetime
+from typing import Dict, Optional
+from pydantic import BaseModel
+
+
+class UploadSignRequest(BaseModel):
+    content_type: str
+    # e.g. image/png (must be an allowed image type)
+
+    size: Optional[int] = None
+    # Size in bytes, checked early when the browser knows it
+
+
+class UploadSignResponse(BaseModel):
+    file_id: str
+    token: str
+    upload_url: str
+    method: str
+    headers: Dict[str, str]
+    max_size: int
+    expires_at: datetime
+
+
+class UploadCompleteRequest(BaseModel):
+    token: str
+    # The same token that was used for the upload
@@ -0,0 +1,26 @@
+from app.config import STORAGE_BACKEND
+from app.storage.base import StorageBackend, StoredFile
+
+# One backend per process, created on first use (or at startup)
+_storage: StorageBackend | None = None
+
+
+def get_storage() -> StorageBackend:
+    # Pick the backend from config (STORAGE_BACKEND)
+    global _storage
+    if _storage is None:
+        if STORAGE_BACKEND == "local":
+            from app.storage.local_backend import LocalStorage
+            _storage = LocalStorage()
+        else:
+            from app.storage.appwrite_backend import AppwriteStorage
+            _storage = AppwriteStorage()
+    return _storage
+
+
+async def close_storage() -> None:
+    # Close the shared client on shutdown; the next get_storage() builds a new one
+    global _storage
+    if _storage is not None:
+        await _storage.close()
+        _storage = None
@@ -0,0 +1,57 @@
+# Appwrite storage backend
+# Talks to the Appwrite REST API with one shared httpx.AsyncClient, so
+# uploads reuse keep-alive connections and TLS sessions instead of doing
+# a fresh handshake for every file.
+
+from typing import BinaryIO
+
+import httpx
+from appwrite.id import ID
+
+from app.config import (
+    APPWRITE_API_KEY,
+    APPWRITE_BUCKET_ID,
+    APPWRITE_ENDPOINT,
+    APPWRITE_PROJECT_ID,
+    UPLOAD_MAX_CONCURRENCY,
+)
+from app.storage.base import StorageBackend, StoredFile
+
+
+class AppwriteStorage(StorageBackend):
+    def __init__(self):
+        # Configured once per process; the connection pool lives as long as the app
+        self.client = httpx.AsyncClient(
+            base_url=APPWRITE_ENDPOINT.rstrip("/"),
+            headers={
+                "X-Appwrite-Project": APPWRITE_PROJECT_ID,
+                "X-Appwrite-Key": APPWRITE_API_KEY,
+            },
+            limits=httpx.Limits(
+                max_connections=UPLOAD_MAX_CONCURRENCY,
+                max_keepalive_connections=UPLOAD_MAX_CONCURRENCY,
+            ),
+            timeout=httpx.Timeout(30.0, connect=5.0),
+        )
+
+    def url_for(self, file_id: str) -> str:
+        return (
+            f"{APPWRITE_ENDPOINT}/storage/buckets/"
+            f"{APPWRITE_BUCKET_ID}/files/{file_id}/view"
+            f"?project={APPWRITE_PROJECT_ID}"
+        )
+
+    async def _save(self, stream: BinaryIO, filename: str, content_type: str) -> StoredFile:
+        # Same request the Appwrite SDK's storage.create_file() sends;
+        # httpx streams the file object into the multipart body chunk by chunk
+        response = await self.client.post(
+            f"/storage/buckets/{APPWRITE_BUCKET_ID}/files",
+            data={"fileId": ID.unique()},
+            files={"file": (filename, stream, content_type)},
+        )
+        response.raise_for_status()
+        file_id = response.json()["$id"]
+        return StoredFile(file_id=file_id, url=self.url_for(file_id))
+
+    async def close(self) -> None:
+        await self.client.aclose()
@@ -0,0 +1,66 @@
+# Storage layer for uploaded images
+# Every backend exposes the same async interface, so the upload route
+# never blocks the event loop and backends can be swapped by config.
+
+import asyncio
+from dataclasses import dataclass
+from typing import BinaryIO
+
+from app.config import UPLOAD_MAX_CONCURRENCY
+
+
+@dataclass
+class StoredFile:
+    file_id: str
+    url: str
+
+
+@dataclass
+class StoredObject:
+    # What the API needs to verify a file that was uploaded directly
+    size: int
+    sha256: str
+    head: bytes  # first bytes, for format sniffing
+
+
+# Shared by all backends: caps in-flight uploads per worker so a burst of
+# uploads cannot open unlimited connections to the storage service.
+_upload_slots = asyncio.Semaphore(UPLOAD_MAX_CONCURRENCY)
+
+
+class StorageBackend:
+    """
+    Base class for image storage.
+    Subclasses implement _save(); callers use save().
+    """
+
+    async def save(self, stream: BinaryIO, filename: str, content_type: str) -> StoredFile:
+        # stream: a file object positioned at the start; it is read in chunks,
+        # never copied into one big bytes object
+        async with _upload_slots:
+            return await self._save(stream, filename, content_type)
+
+    async def _save(self, stream: BinaryIO, filename: str, content_type: str) -> StoredFile:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        # Release pooled connections (called on app shutdown)
+        return None
+
+    def url_for(self, file_id: str) -> str:
+        raise NotImplementedError
+
+    # ---------- direct (browser -> storage) uploads ----------
+    # Only LocalStorage implements these; the /sign and /complete routes
+    # are registered only for STORAGE_BACKEND=local (see app/main.py).
+
+    def direct_upload_target(self, file_id: str, token: str, content_type: str) -> dict:
+        # Where and how the browser sends the file
+        raise NotImplementedError
+
+    async def stat(self, file_id: str) -> StoredObject | None:
+        # Size/hash of a stored file, or None when it does not exist
+        raise NotImplementedError
+
+    async def delete(self, file_id: str) -> None:
+        raise NotImplementedError
@@ -0,0 +1,77 @@
+# Local filesystem storage backend
+# Stores images under LOCAL_STORAGE_DIR so the upload path can be
+# developed and load-tested without Appwrite.
+
+import asyncio
+import hashlib
+import mimetypes
+import os
+import shutil
+import uuid
+from typing import BinaryIO
+
+from app.config import LOCAL_STORAGE_DIR, LOCAL_STORAGE_URL, LOCAL_STORAGE_UPLOAD_URL
+from app.storage.base import StorageBackend, StoredFile, StoredObject
+
+
+class LocalStorage(StorageBackend):
+    def __init__(self, directory: str = LOCAL_STORAGE_DIR, base_url: str = LOCAL_STORAGE_URL):
+        self.directory = directory
+        self.base_url = base_url.rstrip("/")
+        os.makedirs(self.directory, exist_ok=True)
+
+    def url_for(self, file_id: str) -> str:
+        return f"{self.base_url}/{file_id}"
+
+    def _write(self, file_id: str, stream: BinaryIO) -> None:
+        # write to a temp name first so readers never see half a file
+        path = os.path.join(self.directory, file_id)
+        tmp_path = f"{path}.part"
+        with open(tmp_path, "wb") as f:
+            shutil.copyfileobj(stream, f)
+        os.replace(tmp_path, path)
+
+    async def _save(self, stream: BinaryIO, filename: str, content_type: str) -> StoredFile:
+        # keep an extension so the static file server sends the right content type
+        extension = mimetypes.guess_extension(content_type) or ""
+        file_id = f"{uuid.uuid4().hex}{extension}"
+
+        # disk writes are blocking, so they run in a worker thread
+        await asyncio.to_thread(self._write, file_id, stream)
+        return StoredFile(file_id=file_id, url=self.url_for(file_id))
+
+    # ---------- direct uploads (see app/storage/local_server.py) ----------
+
+    def direct_upload_target(self, file_id: str, token: str, content_type: str) -> dict:
+        return {
+            "upload_url": f"{LOCAL_STORAGE_UPLOAD_URL.rstrip('/')}/{file_id}",
+            "method": "PUT",
+            "headers": {
+                "Authorization": f"Bearer {token}",
+                "Content-Type": content_type,
+            },
+        }
+
+    def _stat(self, file_id: str) -> StoredObject | None:
+        path = os.path.join(self.directory, os.path.basename(file_id))
+        if not os.path.isfile(path):
+            return None
+
+        digest = hashlib.sha256()
+        head = b""
+        with open(path, "rb") as f:
+            while chunk := f.read(64 * 1024):
+                if not head:
+                    head = chunk[:64]
+                digest.update(chunk)
+        return StoredObject(size=os.path.getsize(path), sha256=digest.hexdigest(), head=head)
+
+    async def stat(self, file_id: str) -> StoredObject | None:
+        return await asyncio.to_thread(self._stat, file_id)
+
+    async def delete(self, file_id: str) -> None:
+        path = os.path.join(self.directory, os.path.basename(file_id))
+        try:
+            await asyncio.to_thread(os.remove, path)
+        except FileNotFoundError:
+            pass
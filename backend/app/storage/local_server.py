@@ -0,0 +1,85 @@
+# Local stand-in for a storage service that accepts signed direct uploads.
+# Browsers PUT the file here with the token from POST /admin/uploads/sign,
+# so image bytes never pass through the API workers.
+#
+# Run next to the API (same LOCAL_STORAGE_DIR):
+#   uvicorn app.storage.local_server:upload_app --port 9000
+
+import os
+import uuid
+
+from fastapi import FastAPI, Header, HTTPException, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.staticfiles import StaticFiles
+from jose import JWTError
+
+from app.config import LOCAL_STORAGE_DIR
+from app.storage.validation import sniff_image_type
+from app.utils.jwt import decode_upload_token
+
+upload_app = FastAPI(title="Leafclutch local storage")
+
+# The browser calls this server directly from the dashboard
+upload_app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_methods=["PUT", "GET"],
+    allow_headers=["*"],
+)
+
+os.makedirs(LOCAL_STORAGE_DIR, exist_ok=True)
+
+
+@upload_app.put("/{file_id}", status_code=201)
+async def put_file(
+    file_id: str,
+    request: Request,
+    authorization: str | None = Header(default=None),
+):
+    # Step 1: The token must be an upload token for exactly this file
+    token = (authorization or "").removeprefix("Bearer ").strip()
+    try:
+        claims = decode_upload_token(token)
+    except JWTError:
+        raise HTTPException(status_code=401, detail="Invalid or expired upload token")
+
+    if claims["file_id"] != file_id or os.path.basename(file_id) != file_id:
+        raise HTTPException(status_code=403, detail="Token is not valid for this file")
+
+    # A token allows ONE upload: never replace a file that already exists
+    # (the dedup table maps its hash to these exact bytes)
+    path = os.path.join(LOCAL_STORAGE_DIR, file_id)
+    if os.path.exists(path):
+        raise HTTPException(status_code=409, detail="File already uploaded")
+
+    # Step 2: Read the body in chunks, stop as soon as it is too large
+    max_size = claims["max_size"]
+    body = bytearray()
+    async for chunk in request.stream():
+        body.extend(chunk)
+        if len(body) > max_size:
+            raise HTTPException(status_code=413, detail="File too large")
+
+    # Step 3: The bytes must really be the image type the token was issued for
+    if sniff_image_type(bytes(body[:64])) != claims["content_type"]:
+        raise HTTPException(status_code=400, detail="Invalid image type")
+
+    # Step 4: Write to a private temp file (O_EXCL), then publish it with
+    # link(), which fails if the name exists: readers never see half a file
+    # and two PUTs with the same token cannot both win
+    tmp_path = f"{path}.{uuid.uuid4().hex}.part"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(body)
+        os.link(tmp_path, path)
+    except FileExistsError:
+        raise HTTPException(status_code=409, detail="File already uploaded")
+    finally:
+        os.unlink(tmp_path)
+
+    return {"file_id": file_id, "size": len(body)}
+
+
+# Also serve the stored files, like a real storage bucket would
+upload_app.mount("/", StaticFiles(directory=LOCAL_STORAGE_DIR), name="files")
@@ -0,0 +1,75 @@
+# Upload validation for images
+# Reads the upload in small chunks, stops as soon as it is too large,
+# and checks the real file format from its first bytes (magic numbers)
+# instead of trusting the Content-Type the client sent.
+
+import hashlib
+from dataclasses import dataclass
+from typing import BinaryIO
+
+from fastapi import HTTPException, UploadFile
+
+CHUNK_SIZE = 64 * 1024  # 64 KB
+
+# first bytes of each allowed format -> real content type
+# (SVG is not allowed: it can carry scripts)
+def sniff_image_type(head: bytes) -> str | None:
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head.startswith((b"GIF87a", b"GIF89a")):
+        return "image/gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    if head[4:8] == b"ftyp" and head[8:12] in (b"avif", b"avis"):
+        return "image/avif"
+    return None
+
+
+@dataclass
+class ValidatedImage:
+    file: BinaryIO  # rewound to the start, ready to stream to storage
+    size: int
+    content_type: str  # detected from the bytes, not from the client
+    sha256: str  # hex digest of the bytes, used to find duplicate uploads
+
+
+async def read_image_upload(file: UploadFile, max_size: int) -> ValidatedImage:
+    # Step 1: Cheap check when the size is already known
+    if file.size is not None and file.size > max_size:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Image too large (max {max_size // 1_000_000}MB allowed)"
+        )
+
+    # Step 2: Read chunk by chunk, only one chunk is held in memory at a time
+    size = 0
+    content_type = None
+    digest = hashlib.sha256()
+    while chunk := await file.read(CHUNK_SIZE):
+        if content_type is None:
+            # Step 3: The first chunk tells us the real format
+            content_type = sniff_image_type(chunk)
+            if content_type is None:
+                raise HTTPException(status_code=400, detail="Invalid image type")
+
+        size += len(chunk)
+        if size > max_size:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Image too large (max {max_size // 1_000_000}MB allowed)"
+            )
+        digest.update(chunk)
+
+    if content_type is None:
+        raise HTTPException(status_code=400, detail="Empty file")
+
+    # Step 4: Rewind so the storage backend can stream the same file
+    await file.seek(0)
+    return ValidatedImage(
+        file=file.file,
+        size=size,
+        content_type=content_type,
+        sha256=digest.hexdigest(),
+    )
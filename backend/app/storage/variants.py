@@ -0,0 +1,106 @@
+# Image variant pipeline
+# Every upload gets a fixed set of smaller, recompressed copies so the
+# public site can download thumbnails instead of full-size originals.
+# Resizing is CPU heavy, so it runs in a process pool, not on the event loop.
+
+import asyncio
+import io
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+
+from app.config import IMAGE_VARIANT_FORMATS, IMAGE_PROCESS_WORKERS
+
+# name -> max width in pixels (height keeps the aspect ratio)
+VARIANT_WIDTHS = {
+    "thumb": 160,
+    "small": 480,
+    "medium": 960,
+}
+
+# format -> (Pillow format name, content type, encoder options)
+VARIANT_FORMATS = {
+    "webp": ("WEBP", "image/webp", {"quality": 80, "method": 4}),
+    "avif": ("AVIF", "image/avif", {"quality": 60}),
+}
+
+# Refuse "decompression bombs" (tiny files that expand to huge bitmaps)
+Image.MAX_IMAGE_PIXELS = 40_000_000
+
+
+def enabled_formats() -> list[str]:
+    # AVIF needs a Pillow build with libavif
+    return [
+        fmt for fmt in IMAGE_VARIANT_FORMATS
+        if fmt in VARIANT_FORMATS and (fmt != "avif" or features.check("avif"))
+    ]
+
+
+class ImageProcessingError(ValueError):
+    """The bytes looked like an image but could not be decoded."""
+
+
+def render_variants(data: bytes, formats: list[str]) -> dict[str, tuple[bytes, str]]:
+    """
+    Runs inside a worker process.
+    Returns {"thumb_webp": (bytes, "image/webp"), ...}
+    """
+    try:
+        return _render_variants(data, formats)
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as e:
+        raise ImageProcessingError(str(e)) from None
+
+
+def _render_variants(data: bytes, formats: list[str]) -> dict[str, tuple[bytes, str]]:
+    with Image.open(io.BytesIO(data)) as source:
+        # respect the camera rotation, then drop EXIF (privacy + size)
+        image = ImageOps.exif_transpose(source)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+
+        variants = {}
+        for name, width in sorted(VARIANT_WIDTHS.items(), key=lambda item: item[1]):
+            if image.width > width:
+                height = max(1, round(image.height * width / image.width))
+                resized = image.resize((width, height), Image.Resampling.LANCZOS)
+            else:
+                # never upscale: the first size at or above the source gets
+                # the source itself, the larger sizes would be identical copies
+                resized = image
+
+            for fmt in formats:
+                pil_format, content_type, options = VARIANT_FORMATS[fmt]
+                buffer = io.BytesIO()
+                resized.save(buffer, format=pil_format, **options)
+                variants[f"{name}_{fmt}"] = (buffer.getvalue(), content_type)
+
+            if resized is image:
+                break
+
+        return variants
+
+
+# One pool per worker, created on first upload
+_pool: ProcessPoolExecutor | None = None
+
+
+def get_image_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=IMAGE_PROCESS_WORKERS)
+    return _pool
+
+
+def shutdown_image_pool() -> None:
+    # Called on app shutdown
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+
+async def build_variants(data: bytes) -> dict[str, tuple[bytes, str]]:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_image_pool(), render_variants, data, enabled_formats()
+    )
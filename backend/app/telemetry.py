@@ -0,0 +1,101 @@
+# OpenTelemetry tracing (opt-in with TELEMETRY_ENABLED=true)
+# One span per request, one per SQL statement and one per outbound HTTP call
+# (Appwrite storage, Supabase), so a slow endpoint shows where its time went.
+
+import os
+
+from opentelemetry import trace
+from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+from opentelemetry.instrumentation.httpx import HTTPXClientInstrumentor
+from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import SpanProcessor, TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+
+from app.config import (
+    TELEMETRY_ENABLED,
+    TELEMETRY_EXPORTER,
+    TELEMETRY_FILE,
+    TELEMETRY_SERVICE_NAME,
+)
+from app.db.session import async_engine, engine
+
+ROUTE_ATTRIBUTE = "app.route"
+
+_provider: TracerProvider | None = None
+
+
+class RouteAttributionProcessor(SpanProcessor):
+    """
+    Copies the route template (e.g. "/admin/projects/") from the request span
+    onto every span started under it, so SQL and HTTP spans can be grouped
+    by endpoint without walking the trace tree.
+    """
+
+    def on_start(self, span, parent_context=None):
+        parent = trace.get_current_span(parent_context)
+        attributes = getattr(parent, "attributes", None) or {}
+        route = attributes.get(ROUTE_ATTRIBUTE) or attributes.get("http.route")
+        if route:
+            span.set_attribute(ROUTE_ATTRIBUTE, route)
+
+
+class FileSpanExporter(ConsoleSpanExporter):
+    """
+    One JSON span per line in TELEMETRY_FILE. Owns the file: shutdown()
+    (called by the batch processor after its last flush) closes it.
+    """
+
+    def __init__(self, path: str):
+        self._file = open(path, "a")
+        super().__init__(
+            out=self._file,
+            formatter=lambda span: span.to_json(indent=None) + os.linesep,
+        )
+
+    def shutdown(self) -> None:
+        super().shutdown()
+        self._file.close()
+
+
+def _exporter():
+    if TELEMETRY_EXPORTER == "otlp":
+        # Reads OTEL_EXPORTER_OTLP_ENDPOINT (default: collector on localhost:4317)
+        from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+        return OTLPSpanExporter()
+    if TELEMETRY_EXPORTER == "file":
+        return FileSpanExporter(TELEMETRY_FILE)
+    return ConsoleSpanExporter()
+
+
+def setup_telemetry(app) -> None:
+    global _provider
+    if not TELEMETRY_ENABLED or _provider is not None:
+        return
+
+    _provider = TracerProvider(
+        resource=Resource.create({"service.name": TELEMETRY_SERVICE_NAME})
+    )
+    # Attribution must run before export
+    _provider.add_span_processor(RouteAttributionProcessor())
+    _provider.add_span_processor(BatchSpanProcessor(_exporter()))
+    trace.set_tracer_provider(_provider)
+
+    # Request spans (named after the route template)
+    FastAPIInstrumentor.instrument_app(app, tracer_provider=_provider)
+    # SQL spans for both engines (asyncpg runs through async_engine.sync_engine)
+    SQLAlchemyInstrumentor().instrument(
+        engines=[engine, async_engine.sync_engine],
+        tracer_provider=_provider,
+    )
+    # Outbound calls: Appwrite (httpx.AsyncClient) and Supabase/PostgREST (httpx)
+    HTTPXClientInstrumentor().instrument(tracer_provider=_provider)
+
+
+def shutdown_telemetry() -> None:
+    # Flush spans still waiting in the batch processor, then close the exporter
+    # (and its file); safe to call twice
+    global _provider
+    if _provider is not None:
+        _provider.shutdown()
+        _provider = None
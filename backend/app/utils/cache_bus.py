@@ -0,0 +1,131 @@
+# Cross-worker cache invalidation over Postgres LISTEN/NOTIFY
+# Each worker keeps its own response cache, so a write handled by one worker
+# must reach the others. Write handlers mark the namespaces they changed on
+# the session; the NOTIFY is sent inside the same transaction (Postgres only
+# delivers it if the commit succeeds) and every worker's listener evicts.
+
+import asyncio
+import json
+import logging
+import uuid
+
+from sqlalchemy import event, select, func
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+from app.config import CACHE_BUS_ENABLED, CACHE_BUS_CHANNEL, CACHE_BUS_DATABASE_URL
+from app.utils.response_cache import response_cache
+
+logger = logging.getLogger(__name__)
+
+# Identifies this worker so it can skip its own messages (already evicted locally)
+WORKER_ID = uuid.uuid4().hex
+
+_SESSION_KEY = "cache_namespaces"
+RECONNECT_DELAY_SECONDS = 1
+MAX_RECONNECT_DELAY_SECONDS = 30
+
+
+def invalidate_on_commit(db, *namespaces: str) -> None:
+    """Evict these cache namespaces on every worker once `db` commits."""
+    db.info.setdefault(_SESSION_KEY, set()).update(namespaces)
+
+
+# Registered on the Session class, so it covers sync sessions and the
+# sync_session inside every AsyncSession
+@event.listens_for(Session, "before_commit")
+def _notify_changes(session: Session) -> None:
+    namespaces = session.info.get(_SESSION_KEY)
+    if not namespaces or not CACHE_BUS_ENABLED:
+        return
+    payload = json.dumps({"origin": WORKER_ID, "namespaces": sorted(namespaces)})
+    # Transactional: listeners only see it if this commit goes through
+    session.execute(select(func.pg_notify(CACHE_BUS_CHANNEL, payload)))
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_local(session: Session) -> None:
+    namespaces = session.info.pop(_SESSION_KEY, None)
+    if namespaces:
+        response_cache.invalidate(*namespaces)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changes(session: Session) -> None:
+    session.info.pop(_SESSION_KEY, None)
+
+
+# ---------------- listener (one per worker) ----------------
+
+def _listen_dsn() -> str:
+    # asyncpg wants a plain postgresql:// DSN (no SQLAlchemy driver suffix)
+    url = make_url(CACHE_BUS_DATABASE_URL).set(drivername="postgresql")
+    return url.render_as_string(hide_password=False)
+
+
+def _on_notification(connection, pid, channel, payload) -> None:
+    # Anyone who can connect may NOTIFY this channel: check the shape, never
+    # let a bad payload raise inside asyncpg's callback
+    try:
+        message = json.loads(payload)
+    except ValueError:
+        logger.warning("Ignoring malformed cache invalidation: %r", payload)
+        return
+    namespaces = message.get("namespaces", []) if isinstance(message, dict) else None
+    if not isinstance(namespaces, list) or not all(isinstance(name, str) for name in namespaces):
+        logger.warning("Ignoring malformed cache invalidation: %r", payload)
+        return
+    if message.get("origin") == WORKER_ID:
+        return
+    response_cache.invalidate(*namespaces)
+
+
+async def listen_for_invalidations() -> None:
+    # Imported here so the sync-only tools (alembic) do not need asyncpg
+    import asyncpg
+
+    delay = RECONNECT_DELAY_SECONDS
+    while True:
+        connection = None
+        try:
+            connection = await asyncpg.connect(_listen_dsn())
+            lost = asyncio.Event()
+            connection.add_termination_listener(lambda _: lost.set())
+            await connection.add_listener(CACHE_BUS_CHANNEL, _on_notification)
+
+            # Anything sent while we were disconnected is gone: start clean
+            response_cache.clear()
+            delay = RECONNECT_DELAY_SECONDS
+            await lost.wait()
+            logger.warning("Cache invalidation listener lost its connection, reconnecting")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("Cache invalidation listener failed (%s), retrying in %ss", e, delay)
+        finally:
+            if connection is not None and not connection.is_closed():
+                await connection.close()
+        # While the listener is down, entries only expire by TTL
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, MAX_RECONNECT_DELAY_SECONDS)
+
+
+_listener_task: asyncio.Task | None = None
+
+
+def start_listener() -> None:
+    global _listener_task
+    if CACHE_BUS_ENABLED and _listener_task is None:
+        _listener_task = asyncio.create_task(listen_for_invalidations())
+
+
+async def stop_listener() -> None:
+    global _listener_task
+    if _listener_task is None:
+        return
+    _listener_task.cancel()
+    try:
+        await _listener_task
+    except asyncio.CancelledError:
+        pass
+    _listener_task = None
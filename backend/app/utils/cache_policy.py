@@ -0,0 +1,57 @@
+# Cache-Control policies per response cache namespace
+# Public catalog reads can be stored by browsers and any CDN in front of us;
+# admin-only data must never end up in a shared cache.
+
+from dataclasses import dataclass
+
+from app.config import (
+    PUBLIC_CACHE_MAX_AGE,
+    PUBLIC_CACHE_S_MAXAGE,
+    PUBLIC_CACHE_STALE_WHILE_REVALIDATE,
+)
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    max_age: int = 0
+    s_maxage: int | None = None
+    stale_while_revalidate: int | None = None
+    private: bool = False
+
+    def header(self) -> str:
+        if self.private:
+            # Only the admin's own browser may keep it, and must revalidate (ETag)
+            return "private, no-cache" if not self.max_age else f"private, max-age={self.max_age}"
+
+        parts = ["public", f"max-age={self.max_age}"]
+        if self.s_maxage is not None:
+            parts.append(f"s-maxage={self.s_maxage}")
+        if self.stale_while_revalidate:
+            parts.append(f"stale-while-revalidate={self.stale_while_revalidate}")
+        return ", ".join(parts)
+
+
+NO_STORE = "no-store"
+
+PUBLIC_CATALOG = CachePolicy(
+    max_age=PUBLIC_CACHE_MAX_AGE,
+    s_maxage=PUBLIC_CACHE_S_MAXAGE,
+    stale_while_revalidate=PUBLIC_CACHE_STALE_WHILE_REVALIDATE,
+)
+
+# Tune a single area here (e.g. shorter for opportunities that close)
+CACHE_POLICIES: dict[str, CachePolicy] = {
+    "services": PUBLIC_CATALOG,
+    "service_techs": PUBLIC_CATALOG,
+    "projects": PUBLIC_CATALOG,
+    "trainings": PUBLIC_CATALOG,
+    "members": PUBLIC_CATALOG,
+    "opportunities": PUBLIC_CATALOG,
+    # dashboard only (needs a login)
+    "mentors": CachePolicy(private=True),
+}
+
+
+def cache_control_for(namespace: str) -> str:
+    policy = CACHE_POLICIES.get(namespace)
+    return policy.header() if policy else NO_STORE
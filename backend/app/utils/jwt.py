@@ -1,6 +1,6 @@
 from datetime import datetime, timedelta
-from jose import jwt
-from app.config import JWT_SECRET, JWT_ALGORITHM, TOKEN_EXPIRE_MINUTES
+from jose import JWTError, jwt
+from app.config import JWT_SECRET, JWT_ALGORITHM, TOKEN_EXPIRE_MINUTES, UPLOAD_TOKEN_EXPIRE_SECONDS
 
 
 def create_access_token(payload: dict):
@@ -20,3 +20,24 @@ def decode_access_token(token: str):
             "verify_exp":True,
         }
         )
+
+
+# Short-lived token that allows ONE direct upload to storage.
+# It has no "role" claim, so it can never be used as a login token.
+def create_upload_token(file_id: str, content_type: str, max_size: int):
+    expire = datetime.utcnow() + timedelta(seconds=UPLOAD_TOKEN_EXPIRE_SECONDS)
+    data = {
+        "scope": "upload",
+        "file_id": file_id,
+        "content_type": content_type,
+        "max_size": max_size,
+        "exp": expire,
+    }
+    return jwt.encode(data, JWT_SECRET, algorithm=JWT_ALGORITHM), expire
+
+
+def decode_upload_token(token: str):
+    payload = decode_access_token(token)
+    if payload.get("scope") != "upload" or not payload.get("file_id"):
+        raise JWTError("Not an upload token")
+    return payload
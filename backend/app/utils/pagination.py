@@ -0,0 +1,184 @@
+# Keyset (cursor) pagination shared by the list endpoints
+# OFFSET makes Postgres walk and throw away every skipped row, so deep pages
+# get slower. Instead we remember the sort key of the last row sent and ask
+# for rows strictly after it, which an index on the sort columns answers directly.
+
+import base64
+import json
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Sequence
+
+from fastapi import HTTPException, Query
+from sqlalchemy import BigInteger, Select, cast, column, func, select, table, tuple_
+from sqlalchemy.dialects.postgresql import REGCLASS
+from sqlalchemy.ext.asyncio import AsyncSession
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 100
+
+# Response header carrying the cursor for list endpoints that return a plain array
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# How fetch_page reports the total number of rows
+EXACT_TOTAL = "exact"        # count(*) OVER () in the same statement
+ESTIMATED_TOTAL = "estimate"  # pg_class.reltuples: free, ignores filters, only as fresh as the last ANALYZE
+
+
+class CursorParams:
+    """Query params for a cursor-paginated list (use as `params: CursorParams = Depends()`)."""
+
+    def __init__(
+        self,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    ):
+        self.limit = limit
+        self.cursor = cursor
+
+
+@dataclass
+class Page:
+    items: list
+    next_cursor: str | None
+    total: int | None = None
+
+    def headers(self) -> dict:
+        return {NEXT_CURSOR_HEADER: self.next_cursor} if self.next_cursor else {}
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def _decode_value(column, raw: Any) -> Any:
+    # The cursor comes from the client: check every value's JSON type, so a
+    # tampered cursor is a 400 and never reaches Postgres as a type error
+    python_type = column.type.python_type
+    if python_type in (datetime, uuid.UUID, str):
+        if not isinstance(raw, str):
+            raise ValueError(f"{column.key} must be a string")
+        if python_type is datetime:
+            return datetime.fromisoformat(raw)
+        if python_type is uuid.UUID:
+            return uuid.UUID(raw)
+        return raw
+    if python_type is int and (isinstance(raw, bool) or not isinstance(raw, int)):
+        raise ValueError(f"{column.key} must be an integer")
+    return raw
+
+
+@dataclass(frozen=True)
+class Keyset:
+    """
+    Sort order for a paginated query. The last column must be unique (the id)
+    so rows with the same created_at are never skipped or repeated.
+    """
+
+    columns: tuple
+    descending: bool = True
+
+    def encode(self, row) -> str:
+        values = [_encode_value(getattr(row, column.key)) for column in self.columns]
+        return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+    def decode(self, cursor: str) -> list:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded))
+            if not isinstance(values, list) or len(values) != len(self.columns):
+                raise ValueError("wrong cursor length")
+            return [_decode_value(column, value) for column, value in zip(self.columns, values)]
+        except (ValueError, TypeError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    def apply(self, query: Select, params: CursorParams) -> Select:
+        # Step 1: Continue after the last row of the previous page
+        if params.cursor:
+            key = tuple_(*self.columns)
+            after = tuple_(*self.decode(params.cursor))
+            query = query.where(key < after if self.descending else key > after)
+
+        # Step 2: Stable order + one extra row to know if there is a next page
+        order = [column.desc() if self.descending else column.asc() for column in self.columns]
+        return query.order_by(*order).limit(params.limit + 1)
+
+    def page(self, rows: Sequence, params: CursorParams) -> Page:
+        rows = list(rows)
+        if len(rows) <= params.limit:
+            return Page(items=rows, next_cursor=None)
+        rows = rows[:params.limit]
+        return Page(items=rows, next_cursor=self.encode(rows[-1]))
+
+
+def newest_first(model) -> Keyset:
+    """The default order for every list: (created_at, id) descending."""
+    return Keyset(columns=(model.created_at, model.id))
+
+
+# ---------------- page + total in one round trip ----------------
+
+_pg_class = table("pg_class", column("oid"), column("reltuples"))
+
+
+def _exact_totals(query: Select, model):
+    # The window runs in a subquery with the list filters but WITHOUT the
+    # cursor condition, so every page reports the size of the whole listing
+    totals = select(model.id.label("id"), func.count().over().label("total"))
+    if query.whereclause is not None:
+        totals = totals.where(query.whereclause)
+    return totals.subquery("totals")
+
+
+def _estimated_total(model):
+    # reltuples is -1 until the table has been analyzed once
+    return (
+        select(cast(func.greatest(_pg_class.c.reltuples, 0), BigInteger))
+        .where(_pg_class.c.oid == cast(model.__tablename__, REGCLASS))
+        .scalar_subquery()
+    )
+
+
+async def fetch_page(
+    db: AsyncSession,
+    keyset: Keyset,
+    query: Select,
+    params: CursorParams,
+    total: str | None = None,
+) -> Page:
+    """
+    Run one page of `query` (a select of a single model).
+    total=EXACT_TOTAL / ESTIMATED_TOTAL also returns the row count from the
+    same statement instead of a separate SELECT count(*).
+    """
+    if total is None:
+        rows = (await db.scalars(keyset.apply(query, params))).all()
+        return keyset.page(rows, params)
+
+    model = query.column_descriptions[0]["entity"]
+    if total == EXACT_TOTAL:
+        totals = _exact_totals(query, model)
+        counted = query.join(totals, totals.c.id == model.id).add_columns(totals.c.total)
+    elif total == ESTIMATED_TOTAL:
+        counted = query.add_columns(_estimated_total(model).label("total"))
+    else:
+        raise ValueError(f"Unknown total mode: {total}")
+
+    rows = (await db.execute(keyset.apply(counted, params))).all()
+    page = keyset.page([row[0] for row in rows], params)
+
+    if rows:
+        page.total = rows[0][1]
+    elif total == ESTIMATED_TOTAL:
+        page.total = await db.scalar(select(_estimated_total(model)))
+    else:
+        # Empty page (e.g. past the end): no row carried the count
+        page.total = await db.scalar(
+            select(func.count()).select_from(_exact_totals(query, model))
+        )
+    return page
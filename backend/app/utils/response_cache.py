@@ -0,0 +1,193 @@
+# In-process response cache for the GET endpoints
+# The public website reads the same lists on every page view, but the data
+# only changes when an admin edits something. We keep the serialized JSON
+# bytes per (namespace, route + query params) and drop a whole namespace
+# whenever a write handler in that area commits.
+# Each entry carries an ETag (hash of the bytes) and a Last-Modified time, so
+# clients that already have the current version get an empty 304.
+
+import hashlib
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from functools import lru_cache
+from typing import Any
+
+from cachetools import TTLCache
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+from app.config import RESPONSE_CACHE_TTL_SECONDS, RESPONSE_CACHE_MAX_SIZE
+from app.utils.cache_policy import cache_control_for
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    etag: str
+    cache_control: str
+    # extra headers that belong to the body (e.g. the next page cursor)
+    headers: dict = field(default_factory=dict)
+    # Whole second strictly after the namespace last changed on this worker
+    # (None: built from a read that raced a write, only the ETag is valid)
+    last_modified: datetime | None = None
+
+    @classmethod
+    def from_body(
+        cls,
+        namespace: str,
+        body: bytes,
+        headers: dict | None = None,
+        last_modified: datetime | None = None,
+    ) -> "CachedResponse":
+        # Strong validator: same bytes on every worker give the same ETag
+        return cls(
+            body=body,
+            etag=f'"{hashlib.sha256(body).hexdigest()}"',
+            cache_control=cache_control_for(namespace),
+            headers=headers or {},
+            last_modified=last_modified,
+        )
+
+    def trusted_last_modified(self) -> datetime | None:
+        # HTTP dates have one-second resolution. last_modified is the second
+        # AFTER the change, and we only use it once that second has started:
+        # any later change then gets a strictly greater date, so two versions
+        # can never share one Last-Modified.
+        if self.last_modified is None or self.last_modified > datetime.now(timezone.utc):
+            return None
+        return self.last_modified
+
+
+class ResponseCache:
+    def __init__(self, maxsize: int, ttl: int):
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        # sync routes run in a thread pool, so access is locked
+        self._lock = threading.Lock()
+        # Bumped on every invalidation, so a response built from a read that
+        # started before a write is not cached after the write evicted it
+        self._generations: dict[str, int] = {}
+        self._epoch = 0  # bumped by clear()
+        # When each namespace last changed (time.time()); before the first
+        # write we only know the data has not changed since this worker started
+        self._changed_at: dict[str, float] = {}
+        self._cleared_at = time.time()
+        self.hits = 0
+        self.misses = 0
+
+    def generation(self, namespace: str) -> tuple[int, int]:
+        # Read BEFORE querying the database; pass the value to set()
+        with self._lock:
+            return self._epoch, self._generations.get(namespace, 0)
+
+    def get(self, namespace: str, key: str) -> CachedResponse | None:
+        with self._lock:
+            entry = self._cache.get((namespace, key))
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return entry
+
+    def set(
+        self,
+        namespace: str,
+        key: str,
+        body: bytes,
+        headers: dict | None = None,
+        *,
+        generation: tuple[int, int],
+    ) -> CachedResponse:
+        # Always returns the entry for this response, but only stores it if
+        # no write touched the namespace since `generation` was read
+        with self._lock:
+            current = (self._epoch, self._generations.get(namespace, 0)) == generation
+            changed_at = max(self._changed_at.get(namespace, 0.0), self._cleared_at)
+
+        if not current:
+            return CachedResponse.from_body(namespace, body, headers)
+
+        last_modified = datetime.fromtimestamp(int(changed_at), timezone.utc) + timedelta(seconds=1)
+        entry = CachedResponse.from_body(namespace, body, headers, last_modified)
+        with self._lock:
+            # a write may have landed while we hashed the body
+            if (self._epoch, self._generations.get(namespace, 0)) == generation:
+                self._cache[(namespace, key)] = entry
+        return entry
+
+    def invalidate(self, *namespaces: str) -> None:
+        # Drop every cached response that belongs to these namespaces
+        with self._lock:
+            now = time.time()
+            for namespace in namespaces:
+                self._generations[namespace] = self._generations.get(namespace, 0) + 1
+                self._changed_at[namespace] = now
+            for cache_key in [k for k in self._cache.keys() if k[0] in namespaces]:
+                self._cache.pop(cache_key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._epoch += 1
+            self._cleared_at = time.time()
+            self._cache.clear()
+
+
+response_cache = ResponseCache(
+    maxsize=RESPONSE_CACHE_MAX_SIZE,
+    ttl=RESPONSE_CACHE_TTL_SECONDS,
+)
+
+
+def cache_key(request: Request) -> str:
+    # Route path + sorted query params, so ?a=1&b=2 and ?b=2&a=1 share an entry
+    params = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    return f"{request.url.path}?{params}"
+
+
+@lru_cache
+def _adapter(model_type: Any) -> TypeAdapter:
+    return TypeAdapter(model_type)
+
+
+def serialize(model_type: Any, data: Any) -> bytes:
+    # Same JSON FastAPI would produce for response_model=model_type
+    # (from_attributes lets ORM rows through, built models pass as-is)
+    adapter = _adapter(model_type)
+    return adapter.dump_json(adapter.validate_python(data, from_attributes=True))
+
+
+def _not_modified(request: Request, entry: CachedResponse) -> bool:
+    # If-None-Match wins over If-Modified-Since when both are sent (RFC 9110)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or entry.etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    last_modified = entry.trusted_last_modified()
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified <= since
+    return False
+
+
+def json_response(request: Request, entry: CachedResponse) -> Response:
+    headers = {
+        **entry.headers,
+        "Cache-Control": entry.cache_control,
+        "ETag": entry.etag,
+    }
+    last_modified = entry.trusted_last_modified()
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+    # Client already has this version: send the headers only
+    if _not_modified(request, entry):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
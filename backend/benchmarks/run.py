@@ -0,0 +1,325 @@
+# Benchmark the admin API against the seeded dataset (see benchmarks/seed.py)
+# Requests go through httpx's ASGI transport: no server or network in the
+# way, only our routing, dependencies, serialization and the database.
+#   python -m benchmarks.run                  # writes benchmarks/results/<git sha>.json
+#   python -m benchmarks.run --compare benchmarks/results/<old sha>.json
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+from sqlalchemy import select, text
+
+# SQL statements per request come from the X-DB-Queries header, which is off by
+# default; turn it on before app.config is read (an explicit setting still wins)
+os.environ.setdefault("DB_QUERY_STATS_ENABLED", "true")
+
+from app.db.query_stats import QUERY_COUNT_HEADER
+from app.db.session import session_local
+from app.main import app
+from app.models import Member, Mentor, Project, Service, ServiceOffering, ServiceTech, Training
+from app.models.member.enums import MemberRole
+from app.utils.jwt import create_access_token
+from app.utils.response_cache import response_cache
+from benchmarks.seed import BENCH_ADMIN_EMAIL
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+# A response this much slower (p95) than the baseline is reported as a regression
+REGRESSION_RATIO = 1.25
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    # Nearest-rank on the sorted samples; good enough for a few hundred runs
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _summary(latencies: list[float], queries: list[int], sizes: list[int], statuses: list) -> dict:
+    return {
+        "requests": len(latencies),
+        "p50_ms": round(_percentile(latencies, 50), 2),
+        "p95_ms": round(_percentile(latencies, 95), 2),
+        "p99_ms": round(_percentile(latencies, 99), 2),
+        "mean_ms": round(statistics.fmean(latencies), 2),
+        "queries_per_request": round(statistics.fmean(queries), 2) if queries else None,
+        "max_queries": max(queries) if queries else None,
+        "bytes_per_response": round(statistics.fmean(sizes)),
+        "statuses": {str(code): statuses.count(code) for code in sorted(set(statuses), key=str)},
+        # non-2xx answers and exceptions: the timings of such a scenario are not comparable
+        "failures": sum(1 for code in statuses if not (isinstance(code, int) and 200 <= code < 300)),
+    }
+
+
+class Bench:
+    def __init__(self, client: httpx.AsyncClient, iterations: int, warmup: int):
+        self.client = client
+        self.iterations = iterations
+        self.warmup = warmup
+        self.results: dict[str, dict] = {}
+
+    async def _request(self, method: str, url: str, **kwargs) -> tuple[float, httpx.Response | None, str | None]:
+        # An exception inside the app (e.g. an IntegrityError) fails this one
+        # request, not the whole run: it is recorded like an error status
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+            error = None
+        except Exception as e:
+            response, error = None, type(e).__name__
+        return (time.perf_counter() - start) * 1000, response, error
+
+    def _record(self, response, error, latencies, elapsed_ms, queries, sizes, statuses) -> None:
+        latencies.append(elapsed_ms)
+        if response is None:
+            statuses.append(f"error:{error}")
+            sizes.append(0)
+            return
+        statuses.append(response.status_code)
+        sizes.append(len(response.content))
+        if QUERY_COUNT_HEADER in response.headers:
+            queries.append(int(response.headers[QUERY_COUNT_HEADER]))
+
+    async def measure(self, name: str, method: str, url: str, *, cold: bool = False,
+                      body=None, make_body=None, iterations: int | None = None) -> None:
+        # cold: empty the response cache first, so every call reaches the database
+        latencies, queries, sizes, statuses = [], [], [], []
+        runs = iterations or self.iterations
+        for i in range(self.warmup + runs):
+            if cold:
+                response_cache.clear()
+            payload = make_body(i) if make_body else body
+            elapsed_ms, response, error = await self._request(method, url, json=payload)
+            if i < self.warmup:
+                continue
+            self._record(response, error, latencies, elapsed_ms, queries, sizes, statuses)
+
+        result = {"method": method, "url": url, "cold": cold, **_summary(latencies, queries, sizes, statuses)}
+        self.results[name] = result
+        print(f"{name:<40} p50 {result['p50_ms']:>8.2f} ms  "
+              f"p95 {result['p95_ms']:>8.2f} ms  "
+              f"q {result['queries_per_request']}  "
+              f"{result['bytes_per_response']} B"
+              + (f"  FAILED {result['failures']}x {result['statuses']}" if result["failures"] else ""))
+
+    async def deep_pages(self, name: str, url: str, pages: int) -> None:
+        # Follow X-Next-Cursor: keyset pages should cost the same at any depth
+        latencies, queries, sizes, statuses = [], [], [], []
+        cursor = None
+        response_cache.clear()
+        for _ in range(pages):
+            params = {"limit": 50, **({"cursor": cursor} if cursor else {})}
+            elapsed_ms, response, error = await self._request("GET", url, params=params)
+            self._record(response, error, latencies, elapsed_ms, queries, sizes, statuses)
+            if response is None:
+                break
+            cursor = response.headers.get("X-Next-Cursor")
+            if response.status_code == 200 and not cursor and url.endswith("trainings/"):
+                cursor = response.json().get("next_cursor")
+            if not cursor:
+                break
+        self.results[name] = {"method": "GET", "url": url, "cold": True, **_summary(latencies, queries, sizes, statuses)}
+        print(f"{name:<40} {len(latencies)} pages, last page p99 {self.results[name]['p99_ms']:.2f} ms")
+
+
+def _sample_ids() -> dict:
+    db = session_local()
+    try:
+        training = db.execute(select(Training).limit(1)).scalar_one()
+        return {
+            "project": db.execute(select(Project.id).limit(1)).scalar_one(),
+            "service": db.execute(select(Service.id).limit(1)).scalar_one(),
+            "training": training.id,
+            # TrainingUpdate has no defaults (every field must be sent) and the
+            # route writes what it gets, so updates resend the real values
+            "training_fields": {
+                "title": training.title,
+                "photo_url": training.photo_url,
+                "base_price": float(training.base_price),
+                "enroll_from_price": float(training.enroll_from_price) if training.enroll_from_price is not None else None,
+                "discount_type": training.discount_type.value if training.discount_type else None,
+                "discount_value": float(training.discount_value) if training.discount_value is not None else None,
+            },
+            # get_team_member only answers for visible team members (404 otherwise)
+            "member": db.execute(
+                select(Member.id).where(Member.role == MemberRole.TEAM, Member.is_visible == True).limit(1)
+            ).scalar_one(),
+            "mentors": db.execute(select(Mentor.id).limit(3)).scalars().all(),
+            "techs": db.execute(select(ServiceTech.id).limit(4)).scalars().all(),
+            "offerings": db.execute(select(ServiceOffering.id).limit(3)).scalars().all(),
+        }
+    finally:
+        db.close()
+
+
+def check_member_plan() -> dict:
+    # The public team list must use the partial index, not scan every member.
+    # ANALYZE first: the write scenarios just added rows the statistics miss.
+    db = session_local()
+    try:
+        db.execute(text("ANALYZE members"))
+        plan = db.execute(text(
+            "EXPLAIN (FORMAT JSON) SELECT * FROM members "
+            "WHERE role = 'TEAM' AND is_visible "
+            "ORDER BY created_at DESC, id DESC LIMIT 21"
+        )).scalar_one()
+    finally:
+        db.close()
+    plan_text = json.dumps(plan)
+    index = "ix_members_visible_role_created_at_id"
+    return {"index": index, "uses_index": index in plan_text}
+
+
+async def run(iterations: int, warmup: int) -> dict:
+    ids = _sample_ids()
+    token = create_access_token({"sub": BENCH_ADMIN_EMAIL, "role": "admin"})
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport,
+        base_url="http://bench",
+        headers={"Authorization": f"Bearer {token}"},
+    ) as client:
+        bench = Bench(client, iterations, warmup)
+
+        # ---------- list endpoints: empty cache, then warm (cache hit where the route caches) ----------
+        lists = {
+            "list_services": "/admin/services/",
+            "list_projects": "/admin/projects/",
+            "list_trainings": "/admin/trainings/",
+            "list_opportunities": "/api/admin/opportunities",
+            "list_members": "/admin/members",
+            "list_team_members": "/admin/members/teams",
+            "list_intern_members": "/admin/members/interns",
+            "list_mentors": "/admin/mentors/",
+            # the lists above return their default page (100 rows); these are smaller first pages
+            "list_projects_page": "/admin/projects/?limit=50",
+            "list_members_page": "/admin/members?limit=50",
+        }
+        for name, url in lists.items():
+            await bench.measure(f"{name} (cold)", "GET", url, cold=True)
+            await bench.measure(f"{name} (warm)", "GET", url)
+
+        # ---------- detail endpoints ----------
+        await bench.measure("get_project (cold)", "GET", f"/admin/projects/{ids['project']}", cold=True)
+        await bench.measure("get_training (cold)", "GET", f"/admin/trainings/{ids['training']}", cold=True)
+        await bench.measure("get_team_member (cold)", "GET", f"/admin/members/team/{ids['member']}", cold=True)
+
+        # ---------- deep pagination ----------
+        await bench.deep_pages("list_members (all pages)", "/admin/members", pages=200)
+        await bench.deep_pages("list_projects (all pages)", "/admin/projects/", pages=50)
+
+        # ---------- writes (each one also invalidates a cache namespace) ----------
+        tech_ids = [str(t) for t in ids["techs"]]
+        offering_ids = [str(o) for o in ids["offerings"]]
+        mentor_ids = [str(m) for m in ids["mentors"]]
+        await bench.measure("create_service", "POST", "/admin/services/", make_body=lambda i: {
+            "title": f"Bench service {i}", "description": "benchmark",
+            "tech_ids": tech_ids, "offering_ids": offering_ids,
+            "base_price": 1000, "discount_type": "PERCENTAGE", "discount_value": 10,
+        })
+        await bench.measure("update_service", "PATCH", f"/admin/services/{ids['service']}", make_body=lambda i: {
+            "description": f"benchmark update {i}", "tech_ids": tech_ids, "offering_ids": offering_ids,
+        })
+        await bench.measure("create_project", "POST", "/admin/projects/", make_body=lambda i: {
+            "title": f"Bench project {i}", "description": "benchmark", "tech_ids": tech_ids,
+        })
+        await bench.measure("update_project", "PATCH", f"/admin/projects/{ids['project']}", make_body=lambda i: {
+            "description": f"benchmark update {i}", "tech_ids": tech_ids,
+        })
+        await bench.measure("create_member", "POST", "/admin/members", make_body=lambda i: {
+            "name": f"Bench member {i}", "role": "INTERN", "is_visible": False,
+        })
+        await bench.measure("update_member", "PATCH", f"/admin/members/{ids['member']}", make_body=lambda i: {
+            "position": f"Engineer {i}",
+        })
+        await bench.measure("create_training", "POST", "/admin/trainings/", make_body=lambda i: {
+            "title": f"Bench training {i}", "description": None, "photo_url": None,
+            "base_price": 1000, "enroll_from_price": None, "discount_type": None, "discount_value": None,
+            "benefits": ["one", "two", "three"], "mentor_ids": mentor_ids,
+        })
+        await bench.measure("update_training", "PUT", f"/admin/trainings/{ids['training']}", make_body=lambda i: {
+            **ids["training_fields"], "description": f"benchmark update {i}",
+            "benefits": ["one", "two"], "mentor_ids": mentor_ids,
+        })
+        await bench.measure("create_opportunity", "POST", "/api/admin/opportunities", make_body=lambda i: {
+            "title": f"Bench opportunity {i}", "type": "JOB",
+            "job_details": {"employment_type": "Full-time"}, "requirements": ["Python", "SQL"],
+        })
+
+    return bench.results
+
+
+def _git_sha() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(current: dict, baseline_path: Path) -> list[str]:
+    baseline = json.loads(baseline_path.read_text())["results"]
+    regressions = []
+    for name, result in current.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        ratio = result["p95_ms"] / before["p95_ms"] if before["p95_ms"] else 1.0
+        print(f"{name:<40} p95 {before['p95_ms']:>8.2f} -> {result['p95_ms']:>8.2f} ms ({ratio:.2f}x)  "
+              f"queries {before['queries_per_request']} -> {result['queries_per_request']}")
+        if ratio > REGRESSION_RATIO or (result["queries_per_request"] or 0) > (before["queries_per_request"] or 0):
+            regressions.append(name)
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the admin API")
+    parser.add_argument("--iterations", type=int, default=100, help="measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=5, help="unmeasured requests before each scenario")
+    parser.add_argument("--output", type=Path, help="where to write the JSON results")
+    parser.add_argument("--compare", type=Path, help="earlier results file to compare against")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.iterations, args.warmup))
+    plan = check_member_plan()
+    print(f"team members query uses {plan['index']}: {plan['uses_index']}")
+
+    sha = _git_sha()
+    report = {
+        "git_sha": sha,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "iterations": args.iterations,
+        "member_plan": plan,
+        "results": results,
+    }
+    output = args.output or RESULTS_DIR / f"{sha}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"Results written to {output}")
+
+    failed = not plan["uses_index"]
+    broken = [name for name, result in results.items() if result["failures"]]
+    if broken:
+        print("Scenarios with failed requests:", ", ".join(broken))
+        failed = True
+    if args.compare:
+        regressions = compare(results, args.compare)
+        if regressions:
+            print("Regressions:", ", ".join(regressions))
+            failed = True
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
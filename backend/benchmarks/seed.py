@@ -0,0 +1,279 @@
+# Seed a LOCAL Postgres with a large synthetic dataset for benchmarks
+# Run from backend/ after `alembic upgrade head`:
+#   python -m benchmarks.seed --reset
+# Volumes are roughly "a few years of Leafclutch": thousands of members,
+# hundreds of services/projects/trainings, tens of thousands of feedbacks.
+
+import argparse
+import random
+import sys
+import uuid
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import insert, text
+from sqlalchemy.engine import make_url
+
+from app.config import DATABASE_URL
+from app.db.session import engine, session_local
+from app.models import (
+    AdminUser,
+    InternshipDetail,
+    JobDetail,
+    Member,
+    Mentor,
+    Opportunity,
+    OpportunityRequirement,
+    Project,
+    ProjectFeedback,
+    ProjectTechMap,
+    Service,
+    ServiceOffering,
+    ServiceOfferingMap,
+    ServiceTech,
+    ServiceTechMap,
+    Training,
+    TrainingBenefit,
+    TrainingMentor,
+)
+from app.models.member.enums import MemberRole
+from app.models.opportunities.enums import OpportunityType
+from app.models.pricing.enums import DiscountType
+from app.utils.security import pwd_context
+
+BENCH_ADMIN_EMAIL = "bench-admin@example.com"
+BENCH_ADMIN_PASSWORD = "bench-password"
+
+DEFAULT_VOLUMES = {
+    "members": 5000,
+    "services": 300,
+    "projects": 300,
+    "trainings": 300,
+    "mentors": 200,
+    "techs": 60,
+    "offerings": 40,
+    "opportunities": 500,
+    "feedbacks": 30000,
+}
+
+# Every table the seeder writes, children first (used by --reset)
+TABLES = [
+    "project_feedbacks", "project_tech_map", "projects",
+    "service_tech_map", "service_offering_map", "services",
+    "training_benefits", "training_mentors", "trainings", "mentors",
+    "opportunity_requirements", "job_details", "internship_details", "opportunities",
+    "members", "service_techs", "service_offerings",
+]
+
+BATCH_SIZE = 2000
+LOCAL_HOSTS = ("localhost", "127.0.0.1", "::1", "db", "postgres")
+
+rng = random.Random(42)  # same dataset on every run
+
+
+def _created_at() -> datetime:
+    # Spread over ~3 years so keyset pages hit realistic date ranges
+    return datetime.utcnow() - timedelta(seconds=rng.randint(0, 3 * 365 * 24 * 3600))
+
+
+def _price() -> tuple[Decimal, DiscountType | None, Decimal | None]:
+    base = Decimal(rng.randrange(5000, 200000)) / 100
+    discount_type = rng.choice([None, DiscountType.PERCENTAGE, DiscountType.AMOUNT])
+    if discount_type is None:
+        return base, None, None
+    if discount_type == DiscountType.PERCENTAGE:
+        return base, discount_type, Decimal(rng.choice([5, 10, 15, 20, 25]))
+    return base, discount_type, (base / 10).quantize(Decimal("0.01"))
+
+
+def _text(words: int) -> str:
+    vocabulary = ["fast", "secure", "cloud", "design", "data", "mobile", "web", "team",
+                  "scalable", "modern", "python", "react", "api", "learning", "client"]
+    return " ".join(rng.choice(vocabulary) for _ in range(words)).capitalize()
+
+
+def _bulk(db, model, rows: list[dict]) -> None:
+    for start in range(0, len(rows), BATCH_SIZE):
+        db.execute(insert(model), rows[start:start + BATCH_SIZE])
+
+
+def _check_target(allow_remote: bool) -> None:
+    # This script TRUNCATEs tables: never point it at Supabase by accident
+    host = make_url(DATABASE_URL).host or "localhost"
+    if host not in LOCAL_HOSTS and not allow_remote:
+        sys.exit(f"Refusing to seed {host}: benchmarks need a local database (use --allow-remote to override)")
+
+
+def seed(volumes: dict, reset: bool) -> None:
+    db = session_local()
+    try:
+        if reset:
+            db.execute(text(f"TRUNCATE {', '.join(TABLES)} CASCADE"))
+
+        # ---------- lookup tables ----------
+        techs = [{"id": uuid.uuid4(), "name": f"tech-{i}"} for i in range(volumes["techs"])]
+        offerings = [{"id": uuid.uuid4(), "name": f"offering-{i}"} for i in range(volumes["offerings"])]
+        _bulk(db, ServiceTech, techs)
+        _bulk(db, ServiceOffering, offerings)
+        tech_ids = [t["id"] for t in techs]
+        offering_ids = [o["id"] for o in offerings]
+
+        # ---------- services + map tables ----------
+        services, service_techs, service_offerings = [], [], []
+        for i in range(volumes["services"]):
+            base, discount_type, discount_value = _price()
+            created = _created_at()
+            service_id = uuid.uuid4()
+            services.append({
+                "id": service_id, "title": f"Service {i}", "description": _text(40),
+                "photo_url": f"https://example.com/services/{i}.webp",
+                "base_price": base, "discount_type": discount_type, "discount_value": discount_value,
+                "created_at": created, "updated_at": created,
+            })
+            service_techs += [{"service_id": service_id, "tech_id": t} for t in rng.sample(tech_ids, 5)]
+            service_offerings += [{"service_id": service_id, "offering_id": o} for o in rng.sample(offering_ids, 4)]
+        _bulk(db, Service, services)
+        _bulk(db, ServiceTechMap, service_techs)
+        _bulk(db, ServiceOfferingMap, service_offerings)
+
+        # ---------- projects + techs + feedbacks ----------
+        projects, project_techs = [], []
+        for i in range(volumes["projects"]):
+            created = _created_at()
+            project_id = uuid.uuid4()
+            projects.append({
+                "id": project_id, "title": f"Project {i}", "description": _text(60),
+                "photo_url": f"https://example.com/projects/{i}.webp",
+                "project_link": f"https://example.com/p/{i}",
+                "created_at": created, "updated_at": created,
+            })
+            project_techs += [{"project_id": project_id, "tech_id": t} for t in rng.sample(tech_ids, 4)]
+        _bulk(db, Project, projects)
+        _bulk(db, ProjectTechMap, project_techs)
+
+        project_ids = [p["id"] for p in projects]
+        _bulk(db, ProjectFeedback, [
+            {
+                "id": uuid.uuid4(), "project_id": rng.choice(project_ids),
+                "client_name": f"Client {i}", "client_photo": None,
+                "feedback_description": _text(25), "rating": rng.randint(1, 5),
+                "created_at": _created_at(),
+            }
+            for i in range(volumes["feedbacks"])
+        ])
+
+        # ---------- mentors + trainings ----------
+        mentors = []
+        for i in range(volumes["mentors"]):
+            created = _created_at()
+            mentors.append({
+                "id": uuid.uuid4(), "name": f"mentor {i:04d}", "photo_url": None,
+                "specialization": rng.choice(["Python", "Frontend", "Fullstack", "Data"]),
+                "created_at": created, "updated_at": created,
+            })
+        _bulk(db, Mentor, mentors)
+        mentor_ids = [m["id"] for m in mentors]
+
+        trainings, benefits, training_mentors = [], [], []
+        for i in range(volumes["trainings"]):
+            base, discount_type, discount_value = _price()
+            created = _created_at()
+            training_id = uuid.uuid4()
+            trainings.append({
+                "id": training_id, "title": f"Training {i}", "description": _text(50),
+                "photo_url": None, "base_price": base, "enroll_from_price": base / 2,
+                "discount_type": discount_type, "discount_value": discount_value,
+                "created_at": created, "updated_at": created,
+            })
+            benefits += [
+                {"id": uuid.uuid4(), "training_id": training_id, "text": _text(6), "order": n}
+                for n in range(6)
+            ]
+            training_mentors += [
+                {"training_id": training_id, "mentor_id": m, "order": n}
+                for n, m in enumerate(rng.sample(mentor_ids, 3))
+            ]
+        _bulk(db, Training, trainings)
+        _bulk(db, TrainingBenefit, benefits)
+        _bulk(db, TrainingMentor, training_mentors)
+
+        # ---------- opportunities ----------
+        opportunities, requirements, jobs, internships = [], [], [], []
+        for i in range(volumes["opportunities"]):
+            created = _created_at()
+            opportunity_id = uuid.uuid4()
+            kind = rng.choice([OpportunityType.JOB, OpportunityType.INTERNSHIP])
+            opportunities.append({
+                "id": opportunity_id, "title": f"Opportunity {i}", "description": _text(40),
+                "location": rng.choice(["Kathmandu", "Lalitpur", "Remote", "Pokhara"]),
+                "type": kind, "created_at": created, "updated_at": created,
+            })
+            requirements += [
+                {"id": uuid.uuid4(), "opportunity_id": opportunity_id, "text": _text(8), "order": n}
+                for n in range(5)
+            ]
+            if kind == OpportunityType.JOB:
+                jobs.append({"opportunity_id": opportunity_id, "employment_type": "Full-time", "salary_range": "50k-80k"})
+            else:
+                internships.append({"opportunity_id": opportunity_id, "duration_months": 3, "stipend": "10k"})
+        _bulk(db, Opportunity, opportunities)
+        _bulk(db, OpportunityRequirement, requirements)
+        _bulk(db, JobDetail, jobs)
+        _bulk(db, InternshipDetail, internships)
+
+        # ---------- members (mostly interns, many hidden alumni) ----------
+        members = []
+        for i in range(volumes["members"]):
+            created = _created_at()
+            role = MemberRole.TEAM if rng.random() < 0.15 else MemberRole.INTERN
+            members.append({
+                "id": uuid.uuid4(), "name": f"Member {i}", "position": _text(2),
+                "photo_url": f"https://example.com/members/{i}.webp",
+                "start_date": date(2023, 1, 1) + timedelta(days=rng.randint(0, 900)),
+                "end_date": None,
+                "social_media": {"linkedin": f"https://linkedin.com/in/member{i}"},
+                "contact_email": f"member{i}@example.com", "personal_email": None,
+                "contact_number": "+977-9800000000",
+                "is_visible": rng.random() < 0.4, "role": role,
+                "created_at": created, "updated_at": created,
+            })
+        _bulk(db, Member, members)
+
+        # ---------- admin used by the write benchmarks ----------
+        if not db.query(AdminUser).filter(AdminUser.email == BENCH_ADMIN_EMAIL).first():
+            db.add(AdminUser(
+                email=BENCH_ADMIN_EMAIL,
+                hashed_password=pwd_context.hash(BENCH_ADMIN_PASSWORD),
+                is_active=True,
+                role="admin",
+            ))
+
+        db.commit()
+    finally:
+        db.close()
+
+    # Fresh statistics, otherwise the planner still thinks the tables are empty
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("ANALYZE"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Seed a local database for benchmarks")
+    parser.add_argument("--reset", action="store_true", help="TRUNCATE the seeded tables first")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every volume (e.g. 0.1 for a quick run)")
+    parser.add_argument("--allow-remote", action="store_true", help="allow a non-local DATABASE_URL")
+    args = parser.parse_args()
+
+    _check_target(args.allow_remote)
+    volumes = {name: max(1, int(count * args.scale)) for name, count in DEFAULT_VOLUMES.items()}
+    # every service/project/training samples a few of these
+    volumes["techs"] = max(volumes["techs"], 5)
+    volumes["offerings"] = max(volumes["offerings"], 4)
+    volumes["mentors"] = max(volumes["mentors"], 3)
+
+    seed(volumes, reset=args.reset)
+    print("Seeded:", ", ".join(f"{name}={count}" for name, count in volumes.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# The public team/intern lists must be answered by the partial index
+# ix_members_visible_role_created_at_id, not by a scan of every member.
+# Needs a Postgres migrated to head (`alembic upgrade head`), run from backend/:
+#   TEST_DATABASE_URL=postgresql+psycopg2://... python -m pytest tests
+# Everything runs in one transaction that is rolled back, so the data already
+# in that database is left alone.
+
+import json
+import os
+import random
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, insert, select, text
+from sqlalchemy.dialects import postgresql
+
+from app.models.member.enums import MemberRole
+from app.models.member.member import Member
+from app.utils.pagination import CursorParams, newest_first
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+INDEX = "ix_members_visible_role_created_at_id"
+
+pytestmark = pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL is not set")
+
+
+@pytest.fixture(scope="module")
+def connection():
+    engine = create_engine(TEST_DATABASE_URL)
+    with engine.connect() as conn:
+        transaction = conn.begin()
+        _insert_members(conn, count=5000)
+        # Fresh statistics, like autovacuum would have after a real import
+        conn.execute(text("ANALYZE members"))
+        yield conn
+        transaction.rollback()
+    engine.dispose()
+
+
+def _insert_members(conn, count: int) -> None:
+    # Same shape as benchmarks/seed.py: mostly interns, many hidden alumni
+    rng = random.Random(20)
+    now = datetime.utcnow()
+    conn.execute(insert(Member), [
+        {
+            "id": uuid.uuid4(),
+            "name": f"Member {i}",
+            "role": MemberRole.TEAM if rng.random() < 0.15 else MemberRole.INTERN,
+            "is_visible": rng.random() < 0.4,
+            "created_at": now - timedelta(seconds=rng.randint(0, 3 * 365 * 24 * 3600)),
+            "updated_at": now,
+        }
+        for i in range(count)
+    ])
+
+
+def _public_members_query(conn, role: MemberRole, with_cursor: bool) -> str:
+    # The statement list_team_members / list_intern_members send, with the values inlined
+    keyset = newest_first(Member)
+    query = select(Member).where(Member.role == role, Member.is_visible == True)
+    cursor = None
+    if with_cursor:
+        row = conn.execute(keyset.apply(query, CursorParams(limit=20, cursor=None))).all()[-1]
+        cursor = keyset.encode(row)
+    stmt = keyset.apply(query, CursorParams(limit=20, cursor=cursor))
+    return str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+@pytest.mark.parametrize("role", [MemberRole.TEAM, MemberRole.INTERN])
+@pytest.mark.parametrize("with_cursor", [False, True], ids=["first_page", "next_page"])
+def test_public_members_use_partial_index(connection, role, with_cursor):
+    sql = _public_members_query(connection, role, with_cursor)
+    plan = connection.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar_one()
+    assert INDEX in json.dumps(plan), json.dumps(plan, indent=2)
@@ -0,0 +1,33 @@
+import api from "./axios";
+
+// The list endpoints return one page at a time (newest first, max 100 rows).
+// Plain-array endpoints send the next page's cursor in the X-Next-Cursor
+// header, trainings send it as `next_cursor` in the body.
+const PAGE_SIZE = 100;
+
+type PageParams = Record<string, string | number | boolean | undefined>;
+
+export const fetchAllPages = async <T>(
+  url: string,
+  params: PageParams = {}
+): Promise<T[]> => {
+  const items: T[] = [];
+  let cursor: string | undefined;
+
+  do {
+    const response = await api.get(url, {
+      params: { ...params, limit: PAGE_SIZE, ...(cursor ? { cursor } : {}) },
+    });
+    const data = response.data;
+
+    if (Array.isArray(data)) {
+      items.push(...(data as T[]));
+      cursor = response.headers["x-next-cursor"] || undefined;
+    } else {
+      items.push(...((data?.items ?? []) as T[]));
+      cursor = data?.next_cursor || undefined;
+    }
+  } while (cursor);
+
+  return items;
+};
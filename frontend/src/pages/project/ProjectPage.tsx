@@ -29,8 +29,8 @@ const ProjectPage: React.FC = () => {
     setIsLoading(true);
     try {
       const data = await projectService.getAll();
-      const sortedData = Array.isArray(data) ? [...data].reverse() : [];
-      setProjects(sortedData);
+      // The API already returns the newest projects first
+      setProjects(Array.isArray(data) ? data : []);
     } catch {
       setProjects([]);
       toast.error("Failed to load projects");
@@ -1,11 +1,11 @@
 import api from "../api/axios";
+import { fetchAllPages } from "../api/pagination";
 import type { Mentor, MentorPayload } from "../types/mentor";
 
 export const mentorService = {
-  // GET /admin/mentors/
+  // GET /admin/mentors/ (every page)
   getAll: async (): Promise<Mentor[]> => {
-    const response = await api.get<Mentor[]>("/admin/mentors/");
-    return response.data;
+    return fetchAllPages<Mentor>("/admin/mentors/");
   },
 
   // POST /admin/mentors/
@@ -1,4 +1,5 @@
 import api from "../api/axios";
+import { fetchAllPages } from "../api/pagination";
 import type {
   Opportunity,
   OpportunityPayload,
@@ -12,8 +13,7 @@ export const opportunityService = {
     location?: string;
     search?: string;
   }): Promise<Opportunity[]> => {
-    const response = await api.get("/api/admin/opportunities", { params });
-    return response.data;
+    return fetchAllPages<Opportunity>("/api/admin/opportunities", params);
   }, // GET /api/admin/opportunities/{id}
 
   getById: async (id: string): Promise<Opportunity> => {
@@ -1,11 +1,11 @@
 import api from "../api/axios";
+import { fetchAllPages } from "../api/pagination";
 import type { Project, ProjectFeedback } from "../types/project";
 import type { ProjectFormData } from "../schema/projectSchema";
 
 export const projectService = {
   getAll: async (): Promise<Project[]> => {
-    const response = await api.get<Project[]>("/admin/projects");
-    return response.data;
+    return fetchAllPages<Project>("/admin/projects");
   },
 
   create: async (data: ProjectFormData): Promise<Project> => {
@@ -1,4 +1,5 @@
 import api from "../api/axios";
+import { fetchAllPages } from "../api/pagination";
 import type {
   Service,
   ServicePayload,
@@ -27,7 +28,7 @@ const mapService = (data: BackendService): Service => ({
 export const serviceService = {
 
   getAll: async (): Promise<Service[]> => {
-    const { data } = await api.get<BackendService[]>("/admin/services/");
+    const data = await fetchAllPages<BackendService>("/admin/services/");
     return data.map(mapService);
   },
 
@@ -1,4 +1,5 @@
 import api from "../api/axios";
+import { fetchAllPages } from "../api/pagination";
 import type {
   TrainingProgram,
   TrainingFormData,
@@ -13,12 +14,11 @@ const cleanPrice = (price: string | number | null | undefined): number => {
 
 export const trainingService = {
   getAll: async (search?: string): Promise<TrainingProgram[]> => {
-    const { data } = await api.get("/admin/trainings/", {
-      // API defaults to 20 items. We request 100 to ensure the user sees all trainings.
-      // We keep 'search' in case the backend supports it, though docs only list pagination.
-      params: { ...(search ? { search } : {}), page_size: 100 },
+    // The API pages with a cursor (max 100 per page); follow it to get every training.
+    // We keep 'search' in case the backend supports it, though docs only list pagination.
+    return fetchAllPages<TrainingProgram>("/admin/trainings/", {
+      ...(search ? { search } : {}),
     });
-    return data?.items || (Array.isArray(data) ? data : []);
   },
 
   getById: async (id: string): Promise<TrainingProgram> => {
@@ -1,22 +1,20 @@
 import api from "../api/axios";
+import { fetchAllPages } from "../api/pagination";
 import type { User, UserFormData } from "../types/user";
 
 export const userService = {
-  // Fetch all users (Members in backend)
+  // Fetch all users (Members in backend), following the page cursor
   getAll: async () => {
-    const response = await api.get<User[]>("/admin/members");
-    return response.data;
+    return fetchAllPages<User>("/admin/members");
   },
 
   // Get specific groups
   getTeams: async () => {
-    const response = await api.get<User[]>("/admin/members/teams");
-    return response.data;
+    return fetchAllPages<User>("/admin/members/teams");
   },
 
   getInterns: async () => {
-    const response = await api.get<User[]>("/admin/members/interns");
-    return response.data;
+    return fetchAllPages<User>("/admin/members/interns");
   },
 
   // Create new user